@@ -4,3 +4,5 @@ from .initialize import *
 from .admin import *
 from .staff import *
 from .notification import *
+from .query_plans import *
+from .identity import *
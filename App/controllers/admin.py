@@ -1,14 +1,21 @@
-from App.models import Schedule, Shift, ScheduleGroup, Staff
-from App.models.GroupRosterFactory import GroupRosterFactory
-from App.controllers.user import get_user
+import csv
+import io
+import json
+from sqlalchemy import select
+from App.models import Schedule, Shift, ScheduleGroup, Staff, User
+from App.models.GroupRosterFactory import GroupRosterFactory, AUTO_STRATEGY
+from App.models.Strategies import SchedulingState, OverlapIndex
+from App.controllers.identity import require_role
 from App.database import db
-from datetime import datetime
+from datetime import datetime, timedelta
 
-def create_schedule(admin_id, schedule_name):
-    admin = get_user(admin_id)
+# Streamed report rows, same keys as Shift.get_json()
+REPORT_COLUMNS = ["id", "staff_id", "staff_name", "start_time", "schedule_id", "end_time", "clock_in", "clock_out"]
+REPORT_FORMATS = ("ndjson", "csv")
+REPORT_BATCH_SIZE = 1000
 
-    if not admin or admin.role != "admin":
-        raise PermissionError("Only admins can create schedules")
+def create_schedule(admin_id, schedule_name):
+    admin = require_role(admin_id, "admin", "Only admins can create schedules")
 
     new_schedule = Schedule(
         name=schedule_name,
@@ -22,11 +29,13 @@ def create_schedule(admin_id, schedule_name):
     return new_schedule
 
 
-def schedule_shift(admin_id, staff, schedule, start_time, end_time):
-    admin = get_user(admin_id)
+def schedule_shift(admin_id, staff, schedule, start_time, end_time, overlaps=None):
+    """Create a shift for ``staff``, refusing one that overlaps a shift they already have.
 
-    if not admin or admin.role != "admin":
-        raise PermissionError("Only admins can schedule shifts")
+    Callers scheduling many shifts can pass one OverlapIndex for all of them;
+    otherwise only this staff member's shifts in the new shift's window are loaded.
+    """
+    require_role(admin_id, "admin", "Only admins can schedule shifts")
 
     if not staff or staff.role != "staff":
         raise ValueError("Invalid staff member")
@@ -34,6 +43,13 @@ def schedule_shift(admin_id, staff, schedule, start_time, end_time):
     if not schedule:
         raise ValueError("Invalid schedule")
 
+    if overlaps is None:
+        overlaps = OverlapIndex.from_query(Shift.query.filter(
+            Shift.staff_id == staff.id, Shift.start_time < end_time, Shift.end_time > start_time))
+    clash = overlaps.find(staff.id, start_time, end_time)
+    if clash is not None:
+        raise ValueError(f"Staff member already has an overlapping shift (shift {clash})")
+
     new_shift = Shift(
         staff_id=staff.id,
         schedule_id=schedule.id,
@@ -43,25 +59,83 @@ def schedule_shift(admin_id, staff, schedule, start_time, end_time):
 
     db.session.add(new_shift)
     db.session.commit()
+    overlaps.add(staff.id, start_time, end_time, new_shift.id)
 
     return new_shift
 
 
 def get_shift_report(admin_id):
-    admin = get_user(admin_id)
-
-    if not admin or admin.role != "admin":
-        raise PermissionError("Only admins can view shift reports")
+    require_role(admin_id, "admin", "Only admins can view shift reports")
 
-    shifts = Shift.query.order_by(Shift.start_time).all()
+    shifts = Shift.query.options(Shift.json_loader()).order_by(Shift.start_time).all()
     return [shift.get_json() for shift in shifts]
 
 
-def auto_populate_schedule(admin_id, schedule_group_id, shifts, strategy_name):
-    admin = get_user(admin_id)
 
-    if not admin or admin.role != "admin":
-        raise PermissionError("Only admins can auto-populate schedules")
+def shift_report_query():
+    return (
+        select(Shift.id, Shift.staff_id, User.username, Shift.start_time, Shift.schedule_id,
+               Shift.end_time, Shift.clock_in, Shift.clock_out)
+        .outerjoin(User, User.id == Shift.staff_id)
+        .order_by(Shift.start_time, Shift.id)
+    )
+
+
+def iter_shift_report(batch_size=REPORT_BATCH_SIZE):
+    """Yield the shift report as plain dicts without holding it in memory.
+
+    Plain columns are selected (no Shift objects in the identity map) and read
+    through a server-side cursor batch_size rows at a time.
+    """
+    query = shift_report_query().execution_options(yield_per=batch_size)
+    for row in db.session.execute(query):
+        yield {
+            column: value.isoformat() if isinstance(value, datetime) else value
+            for column, value in zip(REPORT_COLUMNS, row)
+        }
+
+
+def _ndjson_chunks(rows, batch_size):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row))
+        if len(lines) == batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _csv_chunks(rows, batch_size):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=REPORT_COLUMNS)
+    writer.writeheader()
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_shift_report(admin_id, fmt="ndjson", batch_size=REPORT_BATCH_SIZE):
+    """Shift report as a generator of text chunks in NDJSON or CSV.
+
+    The permission check runs here, before anything is streamed; memory
+    stays at one batch of rows however large the report is.
+    """
+    require_role(admin_id, "admin", "Only admins can view shift reports")
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+
+    rows = iter_shift_report(batch_size)
+    if fmt == "csv":
+        return _csv_chunks(rows, batch_size)
+    return _ndjson_chunks(rows, batch_size)
+
+def auto_populate_schedule(admin_id, schedule_group_id, shifts, strategy_name, time_budget=None):
+    require_role(admin_id, "admin", "Only admins can auto-populate schedules")
 
     schedule_group = ScheduleGroup.query.get(schedule_group_id)
     if not schedule_group:
@@ -77,16 +151,19 @@ def auto_populate_schedule(admin_id, schedule_group_id, shifts, strategy_name):
 
     # Strategy factory
     factory = GroupRosterFactory()
-    strategy = factory.get_strategy(strategy_name)
-    if not strategy:
+    strategy = factory.get_strategy(strategy_name, time_budget)
+    if not strategy and strategy_name != AUTO_STRATEGY:
         raise ValueError("Invalid strategy name")
 
     # Attach all staff as observers
     for s in staff:
         schedule_group.attach(s)
 
-    # Auto-generate schedule entries
-    generated = strategy.generateSchedule(shifts, staff, schedule_group)
+    # Auto-generate schedule entries, "auto" runs every strategy and keeps the best one
+    if strategy_name == AUTO_STRATEGY:
+        generated = factory.evaluate_strategies(shifts, staff).result.materialize(schedule_group)
+    else:
+        generated = strategy.generateSchedule(shifts, staff, schedule_group)
     if not generated:
         raise ValueError("Schedule generation failed")
 
@@ -96,4 +173,103 @@ def auto_populate_schedule(admin_id, schedule_group_id, shifts, strategy_name):
     # Notify attached observers
     schedule_group.notifyObservers()
 
-    return schedule_group
\ No newline at end of file
+    return schedule_group
+
+
+def reschedule_group(admin_id, schedule_group_id, strategy_name, added=(), removed=()):
+    require_role(admin_id, "admin", "Only admins can reschedule shifts")
+
+    schedule_group = db.session.get(ScheduleGroup, schedule_group_id)
+    if not schedule_group:
+        raise ValueError("Invalid schedule group")
+
+    strategy = GroupRosterFactory().get_strategy(strategy_name)
+    if not strategy:
+        raise ValueError("Invalid strategy name")
+
+    removed = list(removed)
+    for shift in removed:
+        if shift.schedule is None or shift.schedule.schedule_group_id != schedule_group.id:
+            raise ValueError(f"Shift {shift.id} is not in this schedule group")
+
+    staff = Staff.query.all()
+    if not staff:
+        raise ValueError("No staff available")
+
+    # Counters come from (staff_id, start_time, end_time) of the group's current shifts, nothing is re-assigned
+    rows = db.session.query(Shift.staff_id, Shift.start_time, Shift.end_time) \
+        .join(Schedule, Shift.schedule_id == Schedule.id) \
+        .filter(Schedule.schedule_group_id == schedule_group.id)
+    state = SchedulingState.from_assignments(staff, rows)
+
+    changes = strategy.reschedule(state, added=list(added), removed=removed)
+
+    for shift in removed:
+        shift.staff_id = None
+        shift.schedule_id = None
+
+    if len(changes):
+        changes.materialize(schedule_group)
+    db.session.commit()
+
+    return changes
+
+
+def iter_shift_windows(start, end, shift_duration=8, window_days=7, hours=(6, 14, 22)):
+    """Yield the shifts between start and end one window of days at a time."""
+    current = start
+    while current < end:
+        window_end = min(current + timedelta(days=window_days), end)
+        window = []
+        while current < window_end:
+            for hour in hours:
+                shift_start = current.replace(hour=hour, minute=0, second=0)
+                shift_end = shift_start + timedelta(hours=shift_duration)
+                if shift_end <= end:
+                    window.append(Shift(start_time=shift_start, end_time=shift_end))
+            current += timedelta(days=1)
+        yield window
+
+
+def stream_populate_schedule(admin_id, schedule_group_id, shift_windows, strategy_name):
+    admin = require_role(admin_id, "admin", "Only admins can auto-populate schedules")
+
+    schedule_group = db.session.get(ScheduleGroup, schedule_group_id)
+    if not schedule_group:
+        raise ValueError("Invalid schedule group")
+
+    strategy = GroupRosterFactory().get_strategy(strategy_name)
+    if not strategy:
+        raise ValueError("Invalid strategy name")
+
+    staff = Staff.query.all()
+    if not staff:
+        raise ValueError("No staff available")
+
+    # Counters carry across windows, so each window is placed as if the whole horizon ran at once
+    state = SchedulingState(staff)
+    total = 0
+    for window in shift_windows:
+        if not window:
+            continue
+        changes = strategy.reschedule(state, added=window)
+        state.forget_days_before(min(shift.start_time for shift in window).date())
+
+        # Schedules point at the group by id so the group's collection never holds the whole horizon
+        schedules = [Schedule(name=label, created_by=admin.id, schedule_group_id=schedule_group.id)
+                     for label in changes.group_labels]
+        for shift, staff_id, group in zip(changes.shifts, changes.staff_ids, changes.group_index):
+            shift.staff_id = staff_id
+            schedules[group].shifts.append(shift)
+        db.session.add_all(schedules)
+        db.session.commit()
+        total += len(changes)
+
+    if not total:
+        raise ValueError("Shifts list cannot be empty")
+
+    for s in staff:
+        schedule_group.attach(s)
+    schedule_group.notifyObservers()
+
+    return total
\ No newline at end of file
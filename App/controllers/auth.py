@@ -1,23 +1,36 @@
-from flask_jwt_extended import (
-    create_access_token, jwt_required, JWTManager,
-    get_jwt_identity, verify_jwt_in_request
-)
+from flask_jwt_extended import create_access_token, JWTManager
 from App.models import User
 from App.database import db
+from App.controllers.identity import lazy_authenticated, lazy_identity, load_identity, set_current_identity
+from App.controllers.principal_cache import get_principal_cache, init_principal_cache
+from App.passwords import init_password_hasher
 
-def login(username, password):
+def authenticate(username, password):
+  """The user if the password is right, else None.
+
+  A password stored with outdated hash settings is rehashed with the
+  current ones while the plain text is at hand.
+  """
   result = db.session.execute(db.select(User).filter_by(username=username))
   user = result.scalar_one_or_none()
-  if user and user.check_password(password):
+  if not user or not user.check_password(password):
+    return None
+  if user.password_needs_rehash():
+    user.set_password(password)
+    db.session.commit()
+  return user
+
+def login(username, password):
+  user = authenticate(username, password)
+  if user:
     # Store ONLY the user id as a string in JWT 'sub'
     return create_access_token(identity=str(user.id))
   return None
 
 def loginCLI(username, password):
-    result = db.session.execute(db.select(User).filter_by(username=username))
-    user = result.scalar_one_or_none()
+    user = authenticate(username, password)
 
-    if user and user.check_password(password):
+    if user:
         
         if user.active_token:
             return {"message": "User already logged in", "token": user.active_token}
@@ -41,6 +54,9 @@ def logout(username):
 
     user.active_token = None
     db.session.commit()
+    cache = get_principal_cache()
+    if cache is not None:
+        cache.delete(user.id)
     return {"message": f"User {username} logged out successfully"}
 
 def setup_jwt(app):
@@ -52,14 +68,13 @@ def setup_jwt(app):
         user_id = getattr(identity, "id", identity)
         return str(user_id) if user_id is not None else None
 
+    init_principal_cache(app)
+    init_password_hasher(app)
+
+    # current_user is an Identity (id, username, role), usually served without touching the database
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
-        identity = jwt_data["sub"]
-        try:
-            user_id = int(identity)
-        except (TypeError, ValueError):
-            return None
-        return db.session.get(User, user_id)
+        return set_current_identity(load_identity(jwt_data["sub"]))
 
     return jwt
 
@@ -67,14 +82,5 @@ def setup_jwt(app):
 def add_auth_context(app):
     @app.context_processor
     def inject_user():
-        try:
-            verify_jwt_in_request()
-            identity = get_jwt_identity()
-            user_id = int(identity) if identity is not None else None
-            current_user = db.session.get(User, user_id) if user_id is not None else None
-            is_authenticated = current_user is not None
-        except Exception as e:
-            print(e)
-            is_authenticated = False
-            current_user = None
-        return dict(is_authenticated=is_authenticated, current_user=current_user)
+        # Both resolve only when a template reads them, and reuse the identity the route already loaded
+        return dict(is_authenticated=lazy_authenticated, current_user=lazy_identity)
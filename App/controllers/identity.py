@@ -0,0 +1,134 @@
+from collections import namedtuple
+from functools import wraps
+
+from flask import has_request_context, jsonify, request
+from werkzeug.local import LocalProxy
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from App.models import User
+from App.database import db
+from App.controllers.principal_cache import get_principal_cache
+
+# What role checks, views and templates need from a user. A plain tuple, so
+# it stays valid after a commit expires the User it was read from.
+Identity = namedtuple("Identity", "id username role")
+
+# WSGI environ key for the per-request store
+REQUEST_STORE = "roster.identity"
+
+
+def _request_store():
+    # Kept on the request's environ rather than flask.g: create_app() pushes an app context
+    # that outlives requests, so anything in g could leak from one request into the next
+    if not has_request_context():
+        return None
+    return request.environ.setdefault(REQUEST_STORE, {"identities": {}})
+
+
+def _request_cache():
+    store = _request_store()
+    return store["identities"] if store is not None else None
+
+
+def set_current_identity(identity):
+    """Record the identity a route's JWT check resolved, for the rest of the request."""
+    store = _request_store()
+    if store is not None:
+        store["current"] = identity
+    return identity
+
+
+def _to_id(user_id):
+    try:
+        return int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_identity(user_id):
+    """Identity of a user id.
+
+    Looked up in the request's cache, then the cross-request principal
+    cache, and only then in the database, whose answer fills both.
+    """
+    user_id = _to_id(user_id)
+    if user_id is None:
+        return None
+    cache = _request_cache()
+    if cache is not None and user_id in cache:
+        return cache[user_id]
+
+    principals = get_principal_cache()
+    principal = principals.get(user_id) if principals is not None else None
+    if principal is not None:
+        identity = Identity(*principal)
+    else:
+        user = db.session.get(User, user_id)
+        identity = Identity(user.id, user.username, user.role) if user else None
+        if identity is not None and principals is not None:
+            principals.set(user_id, identity)
+
+    if cache is not None:
+        cache[user_id] = identity
+    return identity
+
+
+def current_identity():
+    """Identity of the user behind this request's JWT, or None if there isn't a valid one."""
+    store = _request_store()
+    if store is not None and "current" in store:
+        # Set by the JWT user lookup when the route already verified the token
+        return store["current"]
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = load_identity(get_jwt_identity())
+    except Exception:
+        # No token, an expired one or a bad signature all just mean "not signed in"
+        identity = None
+    return set_current_identity(identity)
+
+
+class _LazyAuthenticated:
+    def __bool__(self):
+        return current_identity() is not None
+
+    def __eq__(self, other):
+        return bool(self) == other
+
+    def __hash__(self):
+        return hash(bool(self))
+
+    def __str__(self):
+        return str(bool(self))
+
+
+# Template stand-ins for current_identity(), resolved on first use: a page that never reads
+# current_user or is_authenticated costs no JWT decode and no lookup
+lazy_identity = LocalProxy(current_identity)
+lazy_authenticated = _LazyAuthenticated()
+
+
+def require_role(user_id, role, message):
+    """Identity of user_id if it has the given role, PermissionError(message) otherwise."""
+    identity = load_identity(user_id)
+    if not identity or identity.role != role:
+        raise PermissionError(message)
+    return identity
+
+
+def role_required(*roles):
+    """View decorator: require a valid JWT whose user has one of the given roles.
+
+    Answers 403 with a JSON error otherwise. The identity is cached for the
+    request, so the controller's own role check doesn't query again.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            verify_jwt_in_request()
+            identity = current_identity()
+            if not identity or identity.role not in roles:
+                return jsonify({"error": f"Only {' or '.join(roles)} users can do this"}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
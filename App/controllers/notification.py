@@ -1,10 +1,15 @@
 from App.models.notification import Notification
 from App.database import db
+from App.interfaces.ObserverDispatcher import current_batch
 
 notifications = []
 
 #Create a new notification and add it to the list
 def create_notification(receiver_id, message):
+    # Inside batched_notifications() the row is queued and written with the rest of the batch
+    batch = current_batch()
+    if batch is not None:
+        return batch.add(receiver_id, message)
     notification = Notification(receiver_id=receiver_id, message=message)
     db.session.add(notification)
     db.session.commit()
@@ -12,9 +17,12 @@ def create_notification(receiver_id, message):
 
 #Retrieve all notifications for a specific user
 def get_user_notifications(receiver_id):
+    return notifications_query(receiver_id).all()
+
+def notifications_query(receiver_id):
     return Notification.query.filter_by(
         receiver_id=receiver_id
-    ).order_by(Notification.timestamp.desc()).all()
+    ).order_by(Notification.timestamp.desc())
 
 # Mark a specific notification as read.
 def mark_as_read(notification_id):
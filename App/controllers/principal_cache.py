@@ -0,0 +1,193 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from App.models import User
+
+# PRINCIPAL_CACHE config values
+PRINCIPAL_CACHE_BACKENDS = ("memory", "sqlite", "none")
+
+# session.info key: identities to write through (or None to drop) once the transaction commits
+PENDING_PRINCIPALS = "principal_cache_pending"
+
+
+class PrincipalCache:
+    """Cross-request cache of (id, username, role) tuples keyed by user id.
+
+    Backends store plain tuples and must be safe to call from any thread.
+    A miss returns None, the caller loads the user and calls set().
+    """
+
+    def get(self, user_id):
+        return None
+
+    def set(self, user_id, principal) -> None:
+        pass
+
+    def delete(self, user_id) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryPrincipalCache(PrincipalCache):
+    """Bounded LRU with a TTL, private to one worker process.
+
+    Other workers only see a change once their copy expires, so keep the
+    TTL short or use the SQLite backend when running several workers.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300.0, clock=time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= self.clock():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def set(self, user_id, principal) -> None:
+        with self._lock:
+            self._entries[user_id] = (self.clock() + self.ttl, tuple(principal))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLitePrincipalCache(PrincipalCache):
+    """TTL cache in a local SQLite file shared by every worker on the host.
+
+    A write or invalidation in one worker is seen by all of them on their
+    next lookup. When full, the entries written longest ago are evicted
+    first.
+    """
+
+    def __init__(self, path, max_entries=10000, ttl=300.0) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS principal ("
+                "user_id INTEGER PRIMARY KEY, username TEXT, role TEXT, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_principal_expires_at ON principal (expires_at)")
+
+    def _connect(self):
+        # A connection per call: sqlite3 connections can't be shared between threads
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def get(self, user_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT user_id, username, role FROM principal WHERE user_id = ? AND expires_at > ?",
+                (user_id, time.time()),
+            ).fetchone()
+        return row
+
+    def set(self, user_id, principal) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO principal (user_id, username, role, expires_at) VALUES (?, ?, ?, ?)",
+                (user_id, principal[1], principal[2], time.time() + self.ttl),
+            )
+            conn.execute(
+                "DELETE FROM principal WHERE expires_at <= ? OR user_id IN ("
+                "SELECT user_id FROM principal ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (time.time(), self.max_entries),
+            )
+
+    def delete(self, user_id) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM principal WHERE user_id = ?", (user_id,))
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM principal")
+
+
+def init_principal_cache(app):
+    backend = app.config.setdefault("PRINCIPAL_CACHE", "memory")
+    ttl = float(app.config.setdefault("PRINCIPAL_CACHE_TTL", 300))
+    size = int(app.config.setdefault("PRINCIPAL_CACHE_SIZE", 1024))
+    if backend == "memory":
+        cache = MemoryPrincipalCache(max_entries=size, ttl=ttl)
+    elif backend == "sqlite":
+        path = app.config.get("PRINCIPAL_CACHE_PATH") or os.path.join(app.instance_path, "principal_cache.sqlite3")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        cache = SQLitePrincipalCache(path, max_entries=size, ttl=ttl)
+    elif backend == "none":
+        cache = PrincipalCache()
+    else:
+        raise ValueError(f"PRINCIPAL_CACHE must be one of {', '.join(PRINCIPAL_CACHE_BACKENDS)}, not {backend!r}")
+    app.extensions["principal_cache"] = cache
+    return cache
+
+
+def get_principal_cache():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("principal_cache")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session, flush_context):
+    pending = session.info.setdefault(PENDING_PRINCIPALS, {})
+    for user in session.new:
+        if isinstance(user, User):
+            pending[user.id] = (user.id, user.username, user.role)
+    for user in session.dirty:
+        if isinstance(user, User):
+            attrs = inspect(user).attrs
+            if attrs.username.history.has_changes() or attrs.role.history.has_changes():
+                pending[user.id] = (user.id, user.username, user.role)
+    for user in session.deleted:
+        if isinstance(user, User):
+            pending[user.id] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _write_through_principals(session):
+    pending = session.info.pop(PENDING_PRINCIPALS, None)
+    cache = get_principal_cache()
+    if not pending or cache is None:
+        return
+    for user_id, principal in pending.items():
+        if principal is None:
+            cache.delete(user_id)
+        else:
+            cache.set(user_id, principal)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_principal_changes(session):
+    session.info.pop(PENDING_PRINCIPALS, None)
@@ -0,0 +1,72 @@
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import select
+
+from App.database import db
+from App.models import Schedule, Shift
+from App.controllers.admin import shift_report_query
+from App.controllers.notification import notifications_query
+from App.controllers.staff import roster_query
+
+# Placeholder values for the bound parameters, the plan doesn't depend on them
+SAMPLE_ID = 1
+SAMPLE_TIME = datetime(2025, 1, 1)
+
+QueryPlan = namedtuple("QueryPlan", "name sql plan problems")
+
+
+def _group_shifts():
+    # ScheduleGroup.find_conflicts() and reschedule_group()
+    return (
+        select(Shift.staff_id, Shift.start_time, Shift.end_time, Shift.id)
+        .join(Schedule, Shift.schedule_id == Schedule.id)
+        .where(Schedule.schedule_group_id == SAMPLE_ID, Shift.staff_id.isnot(None))
+    )
+
+
+# The lookups that run on every request or grow with the shift table
+HOT_QUERIES = {
+    "staff roster window": lambda: roster_query(
+        SAMPLE_ID, SAMPLE_TIME, SAMPLE_TIME, f"{SAMPLE_TIME.isoformat()},{SAMPLE_ID}").statement,
+    "shifts of a staff member": lambda: select(Shift).where(Shift.staff_id == SAMPLE_ID).order_by(Shift.start_time),
+    "shifts of a schedule": lambda: select(Shift).where(Shift.schedule_id == SAMPLE_ID).order_by(Shift.start_time),
+    "shift report": shift_report_query,
+    "notifications of a user": lambda: notifications_query(SAMPLE_ID).statement,
+    "schedules of a group": lambda: select(Schedule).where(Schedule.schedule_group_id == SAMPLE_ID),
+    "shifts of a group": _group_shifts,
+}
+
+
+def _sqlite_problems(plan):
+    problems = []
+    for detail in plan:
+        # "SCAN shift USING INDEX ..." walks an index in order, a bare "SCAN shift" reads the whole table
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            problems.append(f"full table scan: {detail}")
+        elif detail.startswith("USE TEMP B-TREE"):
+            problems.append(f"sort without an index: {detail}")
+    return problems
+
+
+def explain(statement):
+    """Return (sql, plan lines, problems) for a statement on the current database.
+
+    Problems are only detected on SQLite; other databases get the raw plan.
+    """
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        plan = [row[-1] for row in rows]
+        return sql, plan, _sqlite_problems(plan)
+    rows = db.session.execute(db.text(f"EXPLAIN {sql}")).all()
+    return sql, [" ".join(str(value) for value in row) for row in rows], []
+
+
+def explain_hot_queries():
+    plans = []
+    for name, build in HOT_QUERIES.items():
+        sql, plan, problems = explain(build())
+        plans.append(QueryPlan(name, sql, plan, problems))
+    return plans
@@ -1,19 +1,69 @@
 from App.models import Shift
 from App.database import db
 from datetime import datetime
-from App.controllers.user import get_user
+from sqlalchemy import and_, or_
+from App.controllers.identity import require_role
+
+ROSTER_PAGE_SIZE = 50
+MAX_ROSTER_PAGE_SIZE = 500
 
 def get_combined_roster(staff_id):
-    staff = get_user(staff_id)
-    if not staff or staff.role != "staff":
-        raise PermissionError("Only staff can view roster")
-    return [shift.get_json() for shift in Shift.query.order_by(Shift.start_time).all()]
+    require_role(staff_id, "staff", "Only staff can view roster")
+    shifts = Shift.query.options(Shift.json_loader()).order_by(Shift.start_time).all()
+    return [shift.get_json() for shift in shifts]
+
+
+def encode_roster_cursor(shift):
+    return f"{shift.start_time.isoformat()},{shift.id}"
+
+
+def decode_roster_cursor(cursor):
+    try:
+        start_time, shift_id = cursor.rsplit(",", 1)
+        return datetime.fromisoformat(start_time), int(shift_id)
+    except (AttributeError, ValueError):
+        raise ValueError("Invalid roster cursor")
+
+
+def get_staff_roster(staff_id, start=None, end=None, after=None, limit=ROSTER_PAGE_SIZE):
+    """One page of a staff member's own shifts starting in [start, end).
+
+    Pages are keyed on (start_time, id): pass the previous page's next_cursor
+    as after to continue. Each page is one range scan of the
+    (staff_id, start_time) index, so it costs the same on page 1 and page
+    1000 and doesn't grow with the size of the shift table.
+    """
+    staff = require_role(staff_id, "staff", "Only staff can view roster")
+    if start and end and end <= start:
+        raise ValueError("Roster window must end after it starts")
+    limit = max(1, min(int(limit), MAX_ROSTER_PAGE_SIZE))
+
+    # One row past the page tells us whether there is a next one
+    shifts = roster_query(staff.id, start, end, after).options(Shift.json_loader()).limit(limit + 1).all()
+    page = shifts[:limit]
+    return {
+        "shifts": [shift.get_json() for shift in page],
+        "next_cursor": encode_roster_cursor(page[-1]) if len(shifts) > limit else None,
+    }
+
+
+def roster_query(staff_id, start=None, end=None, after=None):
+    query = Shift.query.filter(Shift.staff_id == staff_id)
+    if start:
+        query = query.filter(Shift.start_time >= start)
+    if end:
+        query = query.filter(Shift.start_time < end)
+    if after:
+        after_start, after_id = decode_roster_cursor(after)
+        query = query.filter(or_(
+            Shift.start_time > after_start,
+            and_(Shift.start_time == after_start, Shift.id > after_id),
+        ))
+    return query.order_by(Shift.start_time, Shift.id)
 
 
 def clock_in(staff_id, shift_id):
-    staff = get_user(staff_id)
-    if not staff or staff.role != "staff":
-        raise PermissionError("Only staff can clock in")
+    require_role(staff_id, "staff", "Only staff can clock in")
 
     shift = db.session.get(Shift, shift_id)
 
@@ -26,9 +76,7 @@ def clock_in(staff_id, shift_id):
 
 
 def clock_out(staff_id, shift_id):
-    staff = get_user(staff_id)
-    if not staff or staff.role != "staff":
-        raise PermissionError("Only staff can clock out")
+    require_role(staff_id, "staff", "Only staff can clock out")
 
     shift = db.session.get(Shift, shift_id)
     if not shift or shift.staff_id != staff_id:
@@ -39,7 +87,7 @@ def clock_out(staff_id, shift_id):
     return shift
 
 def get_shift(shift_id):
-    shift = db.session.get(Shift, shift_id)
+    shift = db.session.get(Shift, shift_id, options=[Shift.json_loader()])
     return shift
 
 def update(ObservableRoster):
@@ -1,8 +1,56 @@
+import logging
+
+from flask import current_app, has_app_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from itertools import chain
+
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
 
 
 db = SQLAlchemy()
+logger = logging.getLogger(__name__)
+
+# LAZY_LOAD_GUARD config values
+LAZY_LOAD_GUARD_MODES = ("off", "warn", "raise")
+
+# The roster relationships (and their backrefs) that must be eager-loaded when read in bulk
+GUARDED_RELATIONSHIPS = frozenset({
+    "Shift.staff", "Staff.shifts",
+    "Shift.schedule", "Schedule.shifts",
+    "Schedule.schedule_group", "ScheduleGroup.schedules",
+})
+
+
+class LazyLoadError(InvalidRequestError):
+    """A guarded relationship was lazy loaded while LAZY_LOAD_GUARD is "raise"."""
+
+
+def expire_counter_on_flush(child, foreign_key, parent, counter):
+    """Keep a column_property count on parent correct within a transaction.
+
+    After each flush that inserts, deletes or re-parents a child row, the
+    counter is expired on every affected parent in the identity map, so
+    the next read runs the count again. Nothing outside the flush is
+    touched, and a commit expires everything anyway.
+    """
+    @event.listens_for(Session, "after_flush")
+    def _expire(session, flush_context):
+        parent_ids = set()
+        for obj in chain(session.new, session.dirty, session.deleted):
+            if isinstance(obj, child):
+                # added + unchanged + deleted: the old and the new parent of a reassigned child
+                parent_ids.update(inspect(obj).attrs[foreign_key].history.sum())
+        parent_ids.discard(None)
+        for parent_id in parent_ids:
+            loaded = session.identity_map.get(session.identity_key(parent, parent_id))
+            if loaded is not None:
+                session.expire(loaded, [counter])
+
+    return _expire
+
 
 def get_migrate(app):
     return Migrate(app, db)
@@ -11,4 +59,37 @@ def create_db():
     db.create_all()
     
 def init_db(app):
-    db.init_app(app)
\ No newline at end of file
+    mode = app.config.setdefault("LAZY_LOAD_GUARD", "off")
+    if mode not in LAZY_LOAD_GUARD_MODES:
+        raise ValueError(f"LAZY_LOAD_GUARD must be one of {', '.join(LAZY_LOAD_GUARD_MODES)}, not {mode!r}")
+    db.init_app(app)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _guard_lazy_loads(orm_execute_state):
+    """Report a guarded relationship being lazy loaded, the SELECT that starts an N+1.
+
+    Set LAZY_LOAD_GUARD to "warn" to log each one with a stack trace, or to
+    "raise" to fail the request, as raiseload would. It works at query time
+    rather than by remapping relationships to lazy="raise", so the switch is
+    per app config and needs no model changes. Many-to-one loads answered
+    from the identity map send no SELECT and are allowed.
+    """
+    if not orm_execute_state.is_select or not has_app_context():
+        return
+    state = orm_execute_state.lazy_loaded_from
+    if state is None:
+        return
+    mode = current_app.config.get("LAZY_LOAD_GUARD", "off")
+    if mode == "off":
+        return
+
+    prop = orm_execute_state.loader_strategy_path.prop
+    name = f"{prop.parent.class_.__name__}.{prop.key}"
+    if name not in GUARDED_RELATIONSHIPS:
+        return
+
+    message = f"{name} lazy loaded from {state.class_.__name__} {state.identity}, eager-load it in the query"
+    if mode == "raise":
+        raise LazyLoadError(message)
+    logger.warning(message, stack_info=True)
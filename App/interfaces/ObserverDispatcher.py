@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import insert
+
+from App.database import db
+from App.models.notification import Notification
+
+
+_active_batch: ContextVar[Optional["NotificationBatch"]] = ContextVar("notification_batch", default=None)
+
+
+class NotificationBatch:
+    """Notifications collected while observers are updated, written in one go."""
+
+    def __init__(self) -> None:
+        self.rows: List[dict] = []
+
+    def add(self, receiver_id: int, message: str) -> Notification:
+        self.rows.append({"receiver_id": receiver_id, "message": message})
+        # Callers get an unsaved Notification back, the row itself goes out with the batch
+        return Notification(receiver_id=receiver_id, message=message)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def write(self, session) -> int:
+        if not self.rows:
+            return 0
+        timestamp = datetime.utcnow()
+        for row in self.rows:
+            row.setdefault("timestamp", timestamp)
+        # Core executemany: the ORM would insert row by row to read back each id
+        session.execute(insert(Notification), self.rows)
+        written = len(self.rows)
+        self.rows = []
+        return written
+
+
+def current_batch() -> Optional[NotificationBatch]:
+    return _active_batch.get()
+
+
+@contextmanager
+def batched_notifications(session=None, commit: bool = True):
+    """Queue every create_notification() made inside the block.
+
+    On exit the queued rows are written with one INSERT and, unless commit is
+    False, one commit. Nested blocks join the outermost batch. Nothing is
+    written if the block raises.
+    """
+    outer = _active_batch.get()
+    if outer is not None:
+        yield outer
+        return
+
+    batch = NotificationBatch()
+    token = _active_batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _active_batch.reset(token)
+
+    session = session or db.session
+    if batch.write(session) and commit:
+        session.commit()
+
+
+class BatchedDispatcher:
+    """Delivers an ObservableRoster's update to its observers with a single write.
+
+    Observer.update() implementations run unchanged; the notifications they
+    create are collected and saved together instead of committing one by one.
+    An observer that raises is skipped, as with the plain loop.
+    """
+
+    def __init__(self, session=None) -> None:
+        self.session = session
+
+    def dispatch(self, observable, observers: Iterable) -> int:
+        with batched_notifications(self.session) as batch:
+            for observer in list(observers):
+                try:
+                    observer.update(observable)
+                except Exception:
+                    pass
+            delivered = len(batch)
+        return delivered
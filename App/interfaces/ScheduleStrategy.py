@@ -1,8 +1,66 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 from App.models import Shift, Staff, ScheduleGroup
 
 class ScheduleStrategy(ABC):
+    schedule_name: Optional[str] = None
+
+    @abstractmethod
+    def assign_columns(self, columns: "ShiftColumns", staff: List[Staff]) -> "AssignmentResult":
+        pass
+
+    def assign(self, shifts: List[Shift], staff: List[Staff]) -> "AssignmentResult":
+        from App.models.Strategies.ShiftColumns import ShiftColumns
+        if not shifts or not staff:
+            raise ValueError("Missing shifts or staff")
+        return self.assign_columns(ShiftColumns.from_shifts(shifts), staff)
+
+    def cache_key(self) -> str:
+        # Strategies with tunable parameters must include them here
+        return type(self).__name__
+
+    def generateSchedule(self, shifts: List[Shift], staff: List[Staff], schedule_group: Optional[ScheduleGroup] = None) -> ScheduleGroup:
+        from App.models.Strategies.ResultCache import result_cache
+        return result_cache.get_or_assign(self, shifts, staff).materialize(schedule_group)
+
+    # Incremental scheduling: place single shifts against a SchedulingState
+
     @abstractmethod
-    def generateSchedule(self, shifts: List[Shift], staff: List[Staff]) -> ScheduleGroup:
-        pass
\ No newline at end of file
+    def place(self, state: "SchedulingState", shift: Shift) -> int:
+        pass
+
+    def group_label(self, shift: Shift) -> Optional[str]:
+        # None gives the shift a schedule of its own
+        return None
+
+    def reschedule(self, state: "SchedulingState", added: List[Shift] = (), removed: List[Shift] = ()) -> "AssignmentResult":
+        """Update ``state`` for removed shifts and place added ones, in O(delta log staff).
+
+        Returns only the new assignments; shifts already on the roster keep theirs.
+        """
+        from App.models.Strategies.AssignmentResult import AssignmentResult
+
+        for shift in removed:
+            if shift.staff_id is not None:
+                state.remove(shift.staff_id, shift.start_time, shift.end_time)
+
+        result = AssignmentResult(name=self.schedule_name)
+        groups = {}
+        for shift in sorted(added, key=lambda s: s.start_time):
+            staff_id = self.place(state, shift)
+            if not state.overlaps.is_free(staff_id, shift.start_time, shift.end_time):
+                # Already working then, hand it to whoever is free (or keep it if nobody is)
+                free = state.least_loaded_free(shift.start_time, shift.end_time)
+                if free is not None:
+                    staff_id = free
+            state.add(staff_id, shift.start_time, shift.end_time)
+
+            label = self.group_label(shift)
+            group = groups.get(label) if label is not None else None
+            if group is None:
+                group = result.new_group(label or f"Shift {shift.start_time}")
+                if label is not None:
+                    groups[label] = group
+            result.add(shift, staff_id, group)
+
+        return result
@@ -6,6 +6,12 @@ from App.models.schedule import Schedule
 from App.models.Strategies.EvenDistributionStrategy import EvenDistributionStrategy
 from App.models.Strategies.DayNightBalancedScheduling import DayNightBalancedScheduling
 from App.models.Strategies.MinimizeDaySchedulingStrategy import MinimizeDaySchedulingStrategy
+from App.models.Strategies.LocalSearchStrategy import LocalSearchStrategy
+from App.models.Strategies.MinCostFlowStrategy import MinCostFlowStrategy
+from App.models.Strategies.StrategyEvaluator import StrategyEvaluator, Evaluation
+from App.models.Strategies.ScheduleObjective import ScheduleObjective
+
+AUTO_STRATEGY = "auto"
 
 
 class GroupRosterFactory(RosterFactory): #class diagram might need updating
@@ -16,10 +22,26 @@ class GroupRosterFactory(RosterFactory): #class diagram might need updating
             "even_distribution": EvenDistributionStrategy(),
             "day_night_balanced": DayNightBalancedScheduling(),
             "minimize_day": MinimizeDaySchedulingStrategy(),
+            "local_search": LocalSearchStrategy(),
+            "min_cost_flow": MinCostFlowStrategy(time_budget=2.0),
         }
         
-    def get_strategy(self, name: str):
-        return self._strategies.get(name)
+    def get_strategy(self, name: str, time_budget: Optional[float] = None):
+        strategy = self._strategies.get(name)
+        # Time-budgeted strategies get a per-request copy with the requested budget
+        if strategy is not None and time_budget is not None and hasattr(strategy, "with_budget"):
+            strategy = strategy.with_budget(time_budget)
+        return strategy
+
+    def evaluate_strategies(
+        self,
+        shifts: List,
+        staff: List,
+        objective: Optional[ScheduleObjective] = None,
+        parallel: bool = True,
+    ) -> Evaluation:
+        # Runs every registered strategy on the same input and keeps the lowest objective score
+        return StrategyEvaluator(self._strategies, objective).evaluate(shifts, staff, parallel=parallel)
 
     def createRoster(
         self,
@@ -49,6 +71,8 @@ class GroupRosterFactory(RosterFactory): #class diagram might need updating
 
         if session is not None:
             session.add(schedule_group)
+            # Built outside the session, so adding schedules queued nothing, notify once now
+            schedule_group._send_notifications()
             if commit:
                 try:
                     session.commit()
@@ -66,13 +90,14 @@ class GroupRosterFactory(RosterFactory): #class diagram might need updating
         group_name: Optional[str] = None,
         session: Optional[object] = None,
         commit: bool = False,
+        time_budget: Optional[float] = None,
     ) -> ScheduleGroup:
         # Validate strategy name
         if not strategy_name or not isinstance(strategy_name, str):
             raise ValueError("'strategy_name' must be a non-empty string")
         
-        strategy = self.get_strategy(strategy_name)
-        if not strategy:
+        strategy = self.get_strategy(strategy_name, time_budget)
+        if not strategy and strategy_name != AUTO_STRATEGY:
             raise ValueError(f"Unknown strategy: '{strategy_name}'")
         
         # Validate shifts and staff
@@ -90,7 +115,10 @@ class GroupRosterFactory(RosterFactory): #class diagram might need updating
         
         # Strategy modifies the schedule_group in place
         try:
-            strategy.generateSchedule(shifts, staff, schedule_group)
+            if strategy_name == AUTO_STRATEGY:
+                self.evaluate_strategies(shifts, staff).result.materialize(schedule_group)
+            else:
+                strategy.generateSchedule(shifts, staff, schedule_group)
         except Exception as e:
             if session is not None:
                 session.rollback()
@@ -98,6 +126,8 @@ class GroupRosterFactory(RosterFactory): #class diagram might need updating
         
         if session is not None:
             session.add(schedule_group)
+            # Built outside the session, so adding schedules queued nothing, notify once now
+            schedule_group._send_notifications()
             if commit:
                 try:
                     session.commit()
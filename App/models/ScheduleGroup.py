@@ -1,19 +1,39 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional
 
-from App.database import db
+from sqlalchemy import event, exists, func, insert, literal, or_, select
+from sqlalchemy.orm import Session, column_property, object_session, reconstructor, selectinload
+
+from App.database import db, expire_counter_on_flush
+from App.interfaces.ObserverDispatcher import BatchedDispatcher
 from App.models.schedule import Schedule
+from App.models.shift import Shift
 from App.models.notification import Notification
 
 
+# session.info keys: groups waiting to notify, and the stamp shared by one transaction's notifications
+PENDING_NOTIFICATIONS = "schedule_group_notifications"
+NOTIFICATION_STAMP = "schedule_group_notification_stamp"
+
+
 class ScheduleGroup(db.Model): #had some tweaks since we decided on the notification design after this was writted
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), nullable=True)
     schedules = db.relationship("Schedule", backref="schedule_group", lazy=True)
+    schedule_total = column_property(
+        select(func.count(Schedule.id)).where(Schedule.schedule_group_id == id)
+        .correlate_except(Schedule).scalar_subquery()
+    )
 
     def __init__(self, name: Optional[str] = None) -> None:
         self.name = name
         self._observers: List = []
+
+    @reconstructor
+    def _init_on_load(self) -> None:
+        # The ORM skips __init__ for groups loaded from the database
+        self._observers = []
         
     @property
     def observers(self) -> List:
@@ -28,11 +48,8 @@ class ScheduleGroup(db.Model): #had some tweaks since we decided on the notifica
             self._observers.remove(observer)
 
     def notifyObservers(self) -> None:
-        for o in list(self._observers):
-            try:
-                o.update(self)
-            except Exception:
-                pass
+        # One INSERT and one commit for all observers instead of a commit per staff member
+        BatchedDispatcher().dispatch(self, self._observers)
 
     def updateRoster(self) -> None:
         self.notifyObservers()
@@ -41,39 +58,129 @@ class ScheduleGroup(db.Model): #had some tweaks since we decided on the notifica
         self.schedules.append(schedule)
         self._send_notifications()
 
+    def add_schedules(self, schedules: List[Schedule]) -> None:
+        self.schedules.extend(schedules)
+        self._send_notifications()
+
     def remove_schedule(self, schedule_id: int) -> bool:
         for s in list(self.schedules):
             if getattr(s, "id", None) == schedule_id:
                 self.schedules.remove(s)
-                self._send_notifications()
+                # Staff on the removed schedule are told too, it's no longer in the group by flush time
+                self._send_notifications(removed_schedule_ids=[schedule_id])
                 return True
         return False
 
-    def _send_notifications(self) -> None:
-        if not self.id:
-            return
+    def find_conflicts(self) -> List:
+        """Pairs of overlapping shifts given to the same staff member anywhere in this group.
 
-        staff_ids = set()
-        for schedule in self.schedules:
-            for shift in schedule.shifts:
-                if shift.staff_id:
-                    staff_ids.add(shift.staff_id)
+        Reads (staff_id, start_time, end_time, id) for the whole group in one
+        query and finds every clash in a single sorted sweep.
+        """
+        from App.models.shift import Shift
+        from App.models.Strategies.OverlapIndex import find_conflicts
 
+        if not self.id:
+            rows = [(shift.staff_id, shift.start_time, shift.end_time, shift.id)
+                    for schedule in self.schedules for shift in schedule.shifts]
+        else:
+            rows = db.session.query(Shift.staff_id, Shift.start_time, Shift.end_time, Shift.id) \
+                .join(Schedule, Shift.schedule_id == Schedule.id) \
+                .filter(Schedule.schedule_group_id == self.id, Shift.staff_id.isnot(None))
+        return find_conflicts(rows)
+
+    def _send_notifications(self, removed_schedule_ids: Iterable[int] = ()) -> None:
+        """Queue a notification for every staff member with a shift in this group.
+
+        Nothing is written here. On the next flush (or at commit) each queued
+        group gets one INSERT ... SELECT DISTINCT, so however many schedules
+        are added in a transaction, each staff member is notified once. A
+        group that is in no session and has no id yet has nobody to notify,
+        and may be built with no app context at all (strategies, benchmarks).
+        """
+        session = object_session(self)
+        if session is None:
+            if not self.id:
+                return
+            session = db.session
+        pending = session.info.setdefault(PENDING_NOTIFICATIONS, {})
+        _, removed = pending.setdefault(id(self), (self, set()))
+        removed.update(removed_schedule_ids)
+
+    def _notification_insert(self, removed_schedule_ids, stamp):
         group_name = self.name or f"Schedule Group #{self.id}"
         message = f"Schedule update: {group_name} has been modified"
 
-        for staff_id in staff_ids:
-            notification = Notification(
-                receiver_id=staff_id,
-                message=message,
-                read=False
-            )
-            db.session.add(notification) #should be working correctly now
+        in_group = Schedule.schedule_group_id == self.id
+        if removed_schedule_ids:
+            in_group = or_(in_group, Schedule.id.in_(removed_schedule_ids))
+        # Staff already sent this message earlier in the transaction are skipped
+        already_sent = select(Notification.id).where(
+            Notification.receiver_id == Shift.staff_id,
+            Notification.message == message,
+            Notification.timestamp == stamp,
+        )
+        receivers = select(Shift.staff_id, literal(message), literal(False), literal(stamp)) \
+            .join(Schedule, Shift.schedule_id == Schedule.id) \
+            .where(in_group, Shift.staff_id.isnot(None), ~exists(already_sent)) \
+            .distinct()
+        return insert(Notification.__table__).from_select(["receiver_id", "message", "read", "timestamp"], receivers)
+
+    @staticmethod
+    def json_loader():
+        """Loader option for get_json(): schedules, shifts and staff in three SELECTs in total."""
+        return selectinload(ScheduleGroup.schedules).options(Schedule.json_loader())
+
+    @classmethod
+    def get_for_json(cls, group_id: int) -> Optional["ScheduleGroup"]:
+        return db.session.scalars(select(cls).where(cls.id == group_id).options(cls.json_loader())).first()
+
+    def schedule_count(self) -> int:
+        if "schedules" in self.__dict__:
+            return len(self.schedules)
+        return self.schedule_total or 0
 
     def get_json(self):
         return {
             "id": self.id,
             "name": self.name,
-            "schedule_count": len(self.schedules),
+            "schedule_count": self.schedule_count(),
             "schedules": [s.get_json() for s in self.schedules],
         }
+
+
+expire_counter_on_flush(Schedule, "schedule_group_id", ScheduleGroup, "schedule_total")
+
+
+def _dispatch_notifications(session) -> None:
+    pending = session.info.pop(PENDING_NOTIFICATIONS, None)
+    if not pending:
+        return
+    stamp = session.info.setdefault(NOTIFICATION_STAMP, datetime.utcnow())
+    connection = session.connection()
+    for group, removed in pending.values():
+        if group.id:
+            connection.execute(group._notification_insert(sorted(removed), stamp))
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _notify_after_flush(session, flush_context) -> None:
+    _dispatch_notifications(session)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session) -> None:
+    # A commit with nothing left to flush still owes the queued notifications
+    session.flush()
+    _dispatch_notifications(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _reset_notification_stamp(session) -> None:
+    session.info.pop(NOTIFICATION_STAMP, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_notifications(session) -> None:
+    session.info.pop(PENDING_NOTIFICATIONS, None)
+    session.info.pop(NOTIFICATION_STAMP, None)
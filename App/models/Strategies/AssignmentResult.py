@@ -0,0 +1,170 @@
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from App.database import db
+from App.models import Schedule, ScheduleGroup, Shift
+
+
+# Keeps IN (...) lists under SQLite's bound parameter limit
+ID_CHUNK_SIZE = 500
+
+
+class AssignmentResult:
+    """Compact output of a scheduling strategy.
+
+    Parallel arrays map each shift to the id of the staff member assigned to it
+    and to the group (one future Schedule) it belongs to. Nothing touches the
+    ORM session until materialize() is called, so dry runs stay cheap.
+    """
+
+    __slots__ = ("name", "shifts", "staff_ids", "group_index", "group_labels")
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name
+        self.shifts: List = []
+        self.staff_ids = array("q")
+        self.group_index = array("l")
+        self.group_labels: List[str] = []
+
+    def new_group(self, label: str) -> int:
+        self.group_labels.append(label)
+        return len(self.group_labels) - 1
+
+    def add(self, shift, staff_id: int, group: int) -> None:
+        self.shifts.append(shift)
+        self.staff_ids.append(staff_id)
+        self.group_index.append(group)
+
+    def extend(self, shifts, staff_ids, group_index, group_labels) -> None:
+        """Append a whole kernel output at once; group_index refers to group_labels."""
+        offset = len(self.group_labels)
+        self.group_labels.extend(group_labels)
+        self.shifts.extend(shifts)
+        self.staff_ids.extend(staff_ids)
+        if offset:
+            self.group_index.extend(group + offset for group in group_index)
+        else:
+            self.group_index.extend(group_index)
+
+    def __len__(self) -> int:
+        return len(self.shifts)
+
+    def __iter__(self) -> Iterator[Tuple[object, int]]:
+        return zip(self.shifts, self.staff_ids)
+
+    def shift_ids(self) -> List[int]:
+        return [shift if isinstance(shift, int) else shift.id for shift in self.shifts]
+
+    def as_dict(self) -> Dict[int, int]:
+        return dict(zip(self.shift_ids(), self.staff_ids))
+
+    def _resolve_shifts(self) -> List:
+        # Results built from ShiftColumns.from_query hold ids; load them in a few IN queries
+        missing = [shift for shift in self.shifts if isinstance(shift, int)]
+        if not missing:
+            return self.shifts
+
+        loaded = {}
+        for start in range(0, len(missing), ID_CHUNK_SIZE):
+            chunk = missing[start:start + ID_CHUNK_SIZE]
+            for shift in Shift.query.filter(Shift.id.in_(chunk)):
+                loaded[shift.id] = shift
+        return [loaded[shift] if isinstance(shift, int) else shift for shift in self.shifts]
+
+    def materialize(self, schedule_group: Optional[ScheduleGroup] = None, created_by: int = 1) -> ScheduleGroup:
+        if schedule_group is None:
+            schedule_group = ScheduleGroup(name=self.name)
+
+        schedules = [Schedule(name=label, created_by=created_by) for label in self.group_labels]
+        for shift, staff_id, group in zip(self._resolve_shifts(), self.staff_ids, self.group_index):
+            shift.staff_id = staff_id
+            schedules[group].shifts.append(shift)
+
+        schedule_group.add_schedules(schedules)
+        return schedule_group
+
+    # Bulk persistence: write assignments with one executemany instead of loading each Shift
+
+    def _write(self, session, columns: Dict[str, List]) -> int:
+        shift_ids = self.shift_ids()
+        if not shift_ids:
+            return 0
+
+        # ORM bulk UPDATE by primary key, sent as a single executemany
+        mappings = [{"id": shift_id} for shift_id in shift_ids]
+        for name, values in columns.items():
+            for mapping, value in zip(mappings, values):
+                mapping[name] = value
+        session.execute(update(Shift), mappings)
+
+        # Loaded shifts get the new values as already committed, so the next flush doesn't repeat them
+        for row, shift in enumerate(self.shifts):
+            if not isinstance(shift, int):
+                for name, values in columns.items():
+                    set_committed_value(shift, name, values[row])
+        return len(mappings)
+
+    def apply(self, session=None) -> int:
+        """Write each shift's staff_id in one statement, returns the number of shifts written.
+
+        Shifts stay in whatever schedule they are in. Nothing is committed.
+        """
+        return self._write(session or db.session, {"staff_id": list(self.staff_ids)})
+
+    def persist(self, schedule_group: Optional[ScheduleGroup] = None, created_by: int = 1, session=None) -> List[Schedule]:
+        """Bulk version of materialize() for results that are saved straight away.
+
+        Inserts the group's schedules with one INSERT ... RETURNING, then sets
+        every shift's staff_id and schedule_id with one executemany UPDATE, so
+        the round trips don't grow with the number of shifts. Nothing is
+        committed.
+        """
+        session = session or db.session
+        if schedule_group is None:
+            schedule_group = ScheduleGroup(name=self.name)
+        existing_group = schedule_group.id is not None
+        if not existing_group:
+            session.add(schedule_group)
+            session.flush()
+
+        # One INSERT ... RETURNING with the rows handed back in parameter order (Schedule's
+        # insert sentinel keeps it to one statement on SQLite), so schedules[i] is group_labels[i]
+        created_at = datetime.utcnow()
+        schedules = []
+        if self.group_labels:
+            schedules = session.scalars(
+                insert(Schedule).returning(Schedule, sort_by_parameter_order=True),
+                [{"name": label, "created_by": created_by, "created_at": created_at,
+                  "schedule_group_id": schedule_group.id}
+                 for label in self.group_labels],
+            ).all()
+
+        self._write(session, {
+            "staff_id": list(self.staff_ids),
+            "schedule_id": [schedules[group].id for group in self.group_index],
+        })
+
+        # Fill the new collections in memory so reading them back costs no queries
+        if all(not isinstance(shift, int) for shift in self.shifts):
+            members = [[] for _ in schedules]
+            for shift, group in zip(self.shifts, self.group_index):
+                members[group].append(shift)
+            for schedule, shifts in zip(schedules, members):
+                set_committed_value(schedule, "shifts", shifts)
+        # The counters were read with the schedules, before their shifts were moved in
+        totals = [0] * len(schedules)
+        for group in self.group_index:
+            totals[group] += 1
+        for schedule, total in zip(schedules, totals):
+            set_committed_value(schedule, "shift_total", total)
+        if existing_group:
+            session.expire(schedule_group, ["schedules", "schedule_total"])
+        else:
+            set_committed_value(schedule_group, "schedules", schedules)
+            set_committed_value(schedule_group, "schedule_total", len(schedules))
+        schedule_group._send_notifications()
+        return schedules
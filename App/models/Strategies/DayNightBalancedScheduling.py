@@ -1,50 +1,94 @@
 from App.interfaces.ScheduleStrategy import ScheduleStrategy
-from App.models import Schedule, ScheduleGroup
-from collections import defaultdict
+from App.models.Strategies.AssignmentResult import AssignmentResult
+from App.models.Strategies.OverlapIndex import resolve_overlaps
+from App.models.Strategies.ShiftColumns import from_epoch_us, numpy
+import heapq
 
 
-class DayNightBalancedScheduling(ScheduleStrategy):
+def balanced_picks(day_flags, staff):
+    """Return the staff list position picked for each shift, given its day/night flag.
 
-    def generateSchedule(self, shifts, staff):
-        if not shifts or not staff:
-            raise ValueError("Missing shifts or staff")
+    Keeps a min-heap of (|day - night|, position in staff list) so each pick is
+    O(log staff). Ties break on list position, the same as min() over the list.
+    """
+    balance = {}
+
+    # Only the first entry for an id can ever win a tie, so later duplicates are dropped
+    heap = []
+    for position, member in enumerate(staff):
+        if member.id not in balance:
+            balance[member.id] = 0
+            heap.append((0, position))
+    heapq.heapify(heap)
+
+    picks = []
+    for is_day_shift in day_flags:
+        position = heap[0][1]
+        member_id = staff[position].id
+
+        # day - night, so its absolute value is the imbalance
+        balance[member_id] += 1 if is_day_shift else -1
+
+        # Only the picked member's imbalance changed, so replace the root in place
+        heapq.heapreplace(heap, (abs(balance[member_id]), position))
+        picks.append(position)
+
+    return picks
 
-        schedule_group = ScheduleGroup(name="Day/Night Balanced Schedule")
 
-        # Track number of day and night shifts per staff
-        day_count = defaultdict(int)
-        night_count = defaultdict(int)
+def assign_balanced(shifts, staff):
+    """Return the staff member picked for each shift in (chronological) order."""
+    flags = (6 <= shift.start_time.hour < 18 for shift in shifts)   # 6am–6pm is DAY
+    return [staff[position] for position in balanced_picks(flags, staff)]
 
-        # Sort shifts chronologically for deterministic assignment
-        shifts = sorted(shifts, key=lambda s: s.start_time)
 
-        for shift in shifts:
+def day_night_kernel(columns, staff):
+    """Walk shifts chronologically giving each to the most balanced staff member.
 
-            # Determine shift type
-            hour = shift.start_time.hour
-            is_day_shift = 6 <= hour < 18   # 6am–6pm is DAY
+    The greedy picks depend on each other, so only the sort and the day/night
+    flags are vectorized; the heap walk itself runs over plain Python values.
+    Returns (staff id per row, group per row, group labels), one group per shift.
+    """
+    count = len(columns)
+    if numpy is not None:
+        order = numpy.argsort(columns.starts, kind="stable")
+        positions = numpy.asarray(balanced_picks(columns.is_day[order].tolist(), staff), dtype=numpy.int64)
 
-            # Choose staff who is most balanced so far
-            preferred_staff = min(
-                staff,
-                key=lambda s: abs(day_count[s.id] - night_count[s.id])
-            )
+        staff_ids = numpy.empty(count, dtype=numpy.int64)
+        staff_ids[order] = numpy.asarray([s.id for s in staff], dtype=numpy.int64)[positions]
+        group_index = numpy.empty(count, dtype=numpy.int64)
+        group_index[order] = numpy.arange(count)
 
-            # Update counters
-            if is_day_shift:
-                day_count[preferred_staff.id] += 1
-            else:
-                night_count[preferred_staff.id] += 1
+        labels = [f"Shift {from_epoch_us(start)}" for start in columns.starts[order].tolist()]
+        return staff_ids.tolist(), group_index.tolist(), labels
 
-            # Build and assign schedule item
-            shift.staff_id = preferred_staff.id
+    starts = columns.starts
+    order = sorted(range(count), key=starts.__getitem__)
+    positions = balanced_picks((columns.is_day[row] for row in order), staff)
+
+    staff_ids = [0] * count
+    group_index = [0] * count
+    for group, (row, position) in enumerate(zip(order, positions)):
+        staff_ids[row] = staff[position].id
+        group_index[row] = group
+
+    labels = [f"Shift {from_epoch_us(starts[row])}" for row in order]
+    return staff_ids, group_index, labels
+
+
+class DayNightBalancedScheduling(ScheduleStrategy):
+    schedule_name = "Day/Night Balanced Schedule"
+
+    def assign_columns(self, columns, staff):
+        if not len(columns) or not staff:
+            raise ValueError("Missing shifts or staff")
 
-            schedule = Schedule(
-                name=f"Shift {shift.start_time}",
-                created_by=1
-            )
-            schedule.shifts.append(shift)
+        result = AssignmentResult(name=self.schedule_name)
 
-            schedule_group.add_schedule(schedule)
+        # Sorted chronologically for deterministic assignment, each shift gets its own schedule item
+        assigned, group_index, labels = day_night_kernel(columns, staff)
+        result.extend(columns.shifts, resolve_overlaps(columns, assigned, [s.id for s in staff]), group_index, labels)
+        return result
 
-        return schedule_group
+    def place(self, state, shift):
+        return state.least_imbalanced().id
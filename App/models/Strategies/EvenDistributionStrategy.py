@@ -1,27 +1,66 @@
-from collections import defaultdict
-from App.models import ScheduleGroup, Schedule
 from App.interfaces.ScheduleStrategy import ScheduleStrategy
+from App.models.Strategies.AssignmentResult import AssignmentResult
+from App.models.Strategies.OverlapIndex import resolve_overlaps
+from App.models.Strategies.ShiftColumns import day_from_index, numpy
+
+
+def even_kernel(columns, staff_ids):
+    """Round-robin staff within each day, days kept in order of first appearance.
+
+    Returns (staff id per row, group per row, group labels).
+    """
+    if numpy is not None:
+        days, first_seen, inverse = numpy.unique(columns.day_index, return_index=True, return_inverse=True)
+        group_of_day = numpy.empty(len(days), dtype=numpy.int64)
+        group_of_day[numpy.argsort(first_seen)] = numpy.arange(len(days))
+        group_index = group_of_day[inverse]
+
+        # Position of each row within its day, in input order
+        order = numpy.argsort(group_index, kind="stable")
+        sorted_groups = group_index[order]
+        run_start = numpy.flatnonzero(numpy.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        rank = numpy.empty(len(order), dtype=numpy.int64)
+        rank[order] = numpy.arange(len(order)) - numpy.repeat(run_start, numpy.diff(numpy.r_[run_start, len(order)]))
+
+        staff_array = numpy.asarray(staff_ids, dtype=numpy.int64)
+        labels = [f"Schedule {day_from_index(day)}" for day in days[numpy.argsort(first_seen)]]
+        return staff_array[rank % len(staff_ids)].tolist(), group_index.tolist(), labels
+
+    groups = {}
+    counts = []
+    assigned = []
+    group_index = []
+    for day in columns.day_index:
+        group = groups.get(day)
+        if group is None:
+            group = groups[day] = len(counts)
+            counts.append(0)
+        assigned.append(staff_ids[counts[group] % len(staff_ids)])
+        counts[group] += 1
+        group_index.append(group)
+
+    labels = [f"Schedule {day_from_index(day)}" for day in groups]
+    return assigned, group_index, labels
+
 
 class EvenDistributionStrategy(ScheduleStrategy):
+    schedule_name = "Even Distribution Schedule Group"
 
-    def generateSchedule(self, shifts, staff):
-        if not shifts or not staff:
+    def assign_columns(self, columns, staff):
+        if not len(columns) or not staff:
             raise ValueError("Missing shifts or staff")
 
-        schedule_group = ScheduleGroup(name="Even Distribution Schedule Group") #had this in the wrong place, now it shouldn't need to pass through
-        
-        # Group shifts by date
-        shifts_by_date = defaultdict(list)
-        for shift in shifts:
-            shifts_by_date[shift.start_time.date()].append(shift)
-
-        # Assign staff evenly within each day
-        for day, day_shifts in shifts_by_date.items():
-            schedule = Schedule(name=f"Schedule {day}", created_by=1)
-            for i, shift in enumerate(day_shifts):
-                assigned_staff = staff[i % len(staff)]
-                shift.staff_id = assigned_staff.id
-                schedule.shifts.append(shift)
-            schedule_group.add_schedule(schedule)
-
-        return schedule_group
+        result = AssignmentResult(name=self.schedule_name)
+
+        # Assign staff evenly within each day, then move shifts off anyone already working then
+        staff_ids = [s.id for s in staff]
+        assigned, group_index, labels = even_kernel(columns, staff_ids)
+        result.extend(columns.shifts, resolve_overlaps(columns, assigned, staff_ids), group_index, labels)
+        return result
+
+    def place(self, state, shift):
+        # Next slot in the day's round-robin
+        return state.staff[state.day_shifts[shift.start_time.date()] % len(state.staff)].id
+
+    def group_label(self, shift):
+        return f"Schedule {shift.start_time.date()}"
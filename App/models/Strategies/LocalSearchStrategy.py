@@ -0,0 +1,185 @@
+import math
+import random
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+from App.interfaces.ScheduleStrategy import ScheduleStrategy
+from App.models.Strategies.AssignmentResult import AssignmentResult
+from App.models.Strategies.DayNightBalancedScheduling import DayNightBalancedScheduling
+from App.models.Strategies.OverlapIndex import OverlapIndex
+from App.models.Strategies.ScheduleObjective import METRICS
+from App.models.Strategies.ShiftColumns import day_from_index
+
+# Longest search a caller can ask for, in seconds; larger budgets are cut down to this
+MAX_TIME_BUDGET = 30.0
+
+
+def _as_list(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+class _SearchState:
+    """Assignment plus the running sums behind the objective.
+
+    Uses the ScheduleObjective metrics, each scaled by 1/staff:
+      fairness     = sum(load^2) / n - mean^2   (mean is fixed, so track sum(load^2))
+      day_night    = sum(|day - night|) / n
+      working_days = distinct (staff, day) pairs / n
+    Every counter touched by a move is O(1) to update, so are the deltas.
+    An OverlapIndex over the rows keeps moves from double-booking anyone.
+    """
+
+    def __init__(self, owner, day, sign, staff_count, weights, starts, ends):
+        self.owner = owner
+        self.day = day
+        self.sign = sign
+        self.starts = starts
+        self.ends = ends
+        self.n = staff_count
+        self.w_fair = weights.get("fairness", 0.0) / staff_count
+        self.w_dn = weights.get("day_night", 0.0) / staff_count
+        self.w_days = weights.get("working_days", 0.0) / staff_count
+
+        self.load = [0] * staff_count
+        self.balance = [0] * staff_count
+        self.worked = defaultdict(int)      # (staff, day) -> shifts that day
+        self.overlaps = OverlapIndex()
+        for row, staff in enumerate(owner):
+            self.load[staff] += 1
+            self.balance[staff] += sign[row]
+            self.worked[staff, day[row]] += 1
+            self.overlaps.add(staff, starts[row], ends[row], row)
+
+    def is_free(self, row, target):
+        return self.overlaps.is_free(target, self.starts[row], self.ends[row])
+
+    def move_delta(self, row, target):
+        source = self.owner[row]
+        if source == target:
+            return 0.0
+        sign, day = self.sign[row], self.day[row]
+        load, balance, worked = self.load, self.balance, self.worked
+
+        fair = 2 * (load[target] - load[source] + 1)
+        dn = (abs(balance[source] - sign) - abs(balance[source])
+              + abs(balance[target] + sign) - abs(balance[target]))
+        days = (worked.get((target, day), 0) == 0) - (worked[source, day] == 1)
+        return self.w_fair * fair + self.w_dn * dn + self.w_days * days
+
+    def move(self, row, target):
+        source = self.owner[row]
+        sign, day = self.sign[row], self.day[row]
+        self.load[source] -= 1
+        self.load[target] += 1
+        self.balance[source] -= sign
+        self.balance[target] += sign
+        self.worked[source, day] -= 1
+        if not self.worked[source, day]:
+            del self.worked[source, day]
+        self.worked[target, day] += 1
+        self.overlaps.discard(source, self.starts[row], self.ends[row])
+        self.overlaps.add(target, self.starts[row], self.ends[row], row)
+        self.owner[row] = target
+
+
+class LocalSearchStrategy(ScheduleStrategy):
+    """Greedy start improved by move/swap local search under a wall-clock budget.
+
+    The objective is the same weighted ScheduleObjective used to rank the
+    strategies (fairness, day/night balance, days worked), lower is better.
+    Each candidate move is scored by its delta in O(1) and kept only if it
+    improves the roster.
+    """
+    schedule_name = "Optimized Schedule"
+
+    def __init__(self, time_budget: float = 0.5, weights: Optional[Dict[str, float]] = None,
+                 seed: int = 0, initial: Optional[ScheduleStrategy] = None) -> None:
+        if not math.isfinite(time_budget) or time_budget < 0:
+            raise ValueError("'time_budget' must be a finite number of seconds, not negative")
+        weights = dict(weights) if weights is not None else {name: 1.0 for name in METRICS}
+        unknown = set(weights) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown objective metric(s): {', '.join(sorted(unknown))}")
+        self.time_budget = min(time_budget, MAX_TIME_BUDGET)
+        self.weights = weights
+        self.seed = seed
+        self.initial = initial or DayNightBalancedScheduling()
+
+    def with_budget(self, time_budget: float) -> "LocalSearchStrategy":
+        return LocalSearchStrategy(time_budget, self.weights, self.seed, self.initial)
+
+    def cache_key(self) -> str:
+        weights = ",".join(f"{name}={value}" for name, value in sorted(self.weights.items()))
+        return f"{type(self).__name__}({self.time_budget},{weights},{self.seed},{self.initial.cache_key()})"
+
+    def assign_columns(self, columns, staff):
+        if not len(columns) or not staff:
+            raise ValueError("Missing shifts or staff")
+
+        distinct = list(dict.fromkeys(s.id for s in staff))
+        position = {staff_id: index for index, staff_id in enumerate(distinct)}
+
+        start = self.initial.assign_columns(columns, staff)
+        owner = [position[staff_id] for staff_id in start.staff_ids]
+        days = _as_list(columns.day_index)
+        signs = [1 if is_day else -1 for is_day in _as_list(columns.is_day)]
+
+        state = _SearchState(owner, days, signs, len(distinct), self.weights,
+                             _as_list(columns.starts), _as_list(columns.ends))
+        self._search(state)
+
+        # One schedule per calendar day, in date order
+        group_of_day = {day: group for group, day in enumerate(sorted(set(days)))}
+        result = AssignmentResult(name=self.schedule_name)
+        result.extend(
+            columns.shifts,
+            [distinct[staff] for staff in state.owner],
+            [group_of_day[day] for day in days],
+            [f"Schedule {day_from_index(day)}" for day in sorted(group_of_day)],
+        )
+        return result
+
+    def _search(self, state) -> None:
+        rows, staff_count = len(state.owner), state.n
+        if staff_count < 2 or self.time_budget == 0:
+            return
+
+        rng = random.Random(self.seed)
+        deadline = time.perf_counter() + self.time_budget
+        iteration = 0
+        while True:
+            iteration += 1
+            if iteration & 255 == 0 and time.perf_counter() >= deadline:
+                return
+
+            row = rng.randrange(rows)
+            if rng.random() < 0.5:
+                # Move: hand the shift to someone else
+                target = rng.randrange(staff_count - 1)
+                if target >= state.owner[row]:
+                    target += 1
+                if state.move_delta(row, target) < -1e-12 and state.is_free(row, target):
+                    state.move(row, target)
+                continue
+
+            # Swap: two shifts trade owners, loads stay put
+            other = rng.randrange(rows)
+            a, b = state.owner[row], state.owner[other]
+            if a == b or not state.is_free(row, b):
+                continue
+            delta = state.move_delta(row, b)
+            state.move(row, b)
+            if state.is_free(other, a):
+                delta += state.move_delta(other, a)
+                if delta < -1e-12:
+                    state.move(other, a)
+                    continue
+            state.move(row, a)
+
+    def place(self, state, shift):
+        # Incremental additions fall back to the greedy starting strategy
+        return self.initial.place(state, shift)
+
+    def group_label(self, shift):
+        return f"Schedule {shift.start_time.date()}"
@@ -0,0 +1,103 @@
+import heapq
+import time
+from typing import List, Optional, Tuple
+
+
+class MinCostFlow:
+    """Successive shortest path min-cost flow over integer, non-negative costs.
+
+    Each round runs Dijkstra on reduced costs (Johnson potentials) and pushes
+    flow along the cheapest augmenting path, so convex costs modelled as unit
+    arcs of increasing cost are solved exactly. Edges are stored in flat
+    lists; edge ``e`` and its residual twin ``e ^ 1`` are always adjacent.
+    """
+
+    def __init__(self, nodes: int = 0) -> None:
+        self.graph: List[List[int]] = [[] for _ in range(nodes)]
+        self.to: List[int] = []
+        self.cap: List[int] = []
+        self.cost: List[int] = []
+
+    def add_node(self) -> int:
+        self.graph.append([])
+        return len(self.graph) - 1
+
+    def add_edge(self, source: int, target: int, capacity: int, cost: int) -> int:
+        if cost < 0:
+            raise ValueError("Edge costs must not be negative")
+        edge = len(self.to)
+        self.to += [target, source]
+        self.cap += [capacity, 0]
+        self.cost += [cost, -cost]
+        self.graph[source].append(edge)
+        self.graph[target].append(edge + 1)
+        return edge
+
+    def flow(self, edge: int) -> int:
+        return self.cap[edge ^ 1]
+
+    def solve(self, source: int, sink: int, max_flow: Optional[int] = None,
+              deadline: Optional[float] = None) -> Tuple[int, int]:
+        """Push up to ``max_flow`` units (all it can by default), return (flow, cost).
+
+        With a ``deadline`` (a time.perf_counter() value) it stops augmenting
+        once that has passed and returns the flow pushed so far.
+        """
+        graph, to, cap, cost = self.graph, self.to, self.cap, self.cost
+        nodes = len(graph)
+        potential = [0] * nodes
+        infinity = float("inf")
+        total_flow = total_cost = 0
+
+        while max_flow is None or total_flow < max_flow:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            dist = [infinity] * nodes
+            via = [-1] * nodes
+            done = [False] * nodes
+            settled = []
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, node = heapq.heappop(heap)
+                if done[node]:
+                    continue
+                done[node] = True
+                settled.append(node)
+                if node == sink:
+                    # Nodes past the sink don't affect this path, potentials below stay valid
+                    break
+                base = d + potential[node]
+                for edge in graph[node]:
+                    if cap[edge] > 0:
+                        target = to[edge]
+                        candidate = base + cost[edge] - potential[target]
+                        if candidate < dist[target]:
+                            dist[target] = candidate
+                            via[target] = edge
+                            heapq.heappush(heap, (candidate, target))
+
+            limit = dist[sink]
+            if limit == infinity:
+                break
+            # Adding min(dist, limit) everywhere keeps reduced costs non-negative; shifting
+            # that by -limit (the same for every node) leaves unsettled nodes untouched
+            for node in settled:
+                potential[node] += dist[node] - limit
+
+            push = infinity if max_flow is None else max_flow - total_flow
+            node = sink
+            while node != source:
+                edge = via[node]
+                push = min(push, cap[edge])
+                node = to[edge ^ 1]
+            node = sink
+            while node != source:
+                edge = via[node]
+                cap[edge] -= push
+                cap[edge ^ 1] += push
+                total_cost += push * cost[edge]
+                node = to[edge ^ 1]
+            total_flow += push
+
+        return total_flow, total_cost
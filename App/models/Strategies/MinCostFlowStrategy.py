@@ -0,0 +1,239 @@
+import heapq
+import time
+from collections import defaultdict
+from typing import Optional
+
+from App.interfaces.ScheduleStrategy import ScheduleStrategy
+from App.models.Strategies.AssignmentResult import AssignmentResult
+from App.models.Strategies.DayNightBalancedScheduling import DayNightBalancedScheduling
+from App.models.Strategies.MinCostFlow import MinCostFlow
+from App.models.Strategies.OverlapIndex import resolve_overlaps
+from App.models.Strategies.ShiftColumns import day_from_index
+
+
+def _as_list(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def _expired(deadline) -> bool:
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+def overlap_groups(rows, starts, ends):
+    """Split rows into groups of shifts that all share a common instant.
+
+    Sweeping by end time and opening a group at the first end not covered
+    gives the fewest such groups. Each group is a set of mutually overlapping
+    shifts, so "at most one per staff member per group" is exact for it; two
+    shifts in different groups can still overlap and are left to
+    resolve_overlaps(). Returns ({row: group}, group sizes).
+    """
+    groups = {}
+    sizes = []
+    point = None
+    for row in sorted(rows, key=lambda r: (ends[r], starts[r], r)):
+        if point is None or starts[row] > point:
+            point = max(starts[row], ends[row] - 1)
+            sizes.append(0)
+        groups[row] = len(sizes) - 1
+        sizes[-1] += 1
+    return groups, sizes
+
+
+class MinCostFlowStrategy(ScheduleStrategy):
+    """Fairness-optimal assignment as a min-cost flow, solved one week at a time.
+
+    Per week the network is source -> shift -> (staff, overlap group) ->
+    staff -> sink. The staff -> sink arcs are unit arcs costing the marginal
+    increase of load^2, so the flow minimises the load variance; a small
+    penalty on the shift arcs steers shifts away from staff already leaning
+    the same day/night way. Loads carry over from week to week, and
+    ``max_shifts_per_staff`` caps the total over the whole input.
+
+    A week with more than ``block_size`` shifts is solved in blocks of whole
+    overlap groups, in time order, since the graph grows with shifts x staff.
+    A block with m shifts never needs more than m staff, so only the m +
+    ``pool_slack`` least loaded are wired in, which keeps large rosters fast.
+    A block that can't be covered from that pool is re-solved with every
+    staff member; ``pool_slack=None`` always uses everyone. With a
+    ``time_budget`` (seconds), the flow stops augmenting once it runs out:
+    the shifts it hasn't routed yet, and every later block, are filled
+    greedily with the least loaded staff instead.
+    """
+    schedule_name = "Min-Cost Flow Schedule"
+
+    def __init__(self, max_shifts_per_staff: Optional[int] = None, pool_slack: Optional[int] = 8,
+                 day_night_weight: int = 1, time_budget: Optional[float] = None,
+                 block_size: Optional[int] = 64, initial: Optional[ScheduleStrategy] = None) -> None:
+        if max_shifts_per_staff is not None and max_shifts_per_staff < 1:
+            raise ValueError("'max_shifts_per_staff' must be at least 1")
+        if pool_slack is not None and pool_slack < 0:
+            raise ValueError("'pool_slack' must not be negative")
+        if day_night_weight < 0:
+            raise ValueError("'day_night_weight' must not be negative")
+        if time_budget is not None and time_budget < 0:
+            raise ValueError("'time_budget' must not be negative")
+        if block_size is not None and block_size < 1:
+            raise ValueError("'block_size' must be at least 1")
+        self.max_shifts_per_staff = max_shifts_per_staff
+        self.pool_slack = pool_slack
+        self.day_night_weight = day_night_weight
+        self.time_budget = time_budget
+        self.block_size = block_size
+        self.initial = initial or DayNightBalancedScheduling()
+
+    def with_budget(self, time_budget: float) -> "MinCostFlowStrategy":
+        return MinCostFlowStrategy(self.max_shifts_per_staff, self.pool_slack, self.day_night_weight,
+                                   time_budget, self.block_size, self.initial)
+
+    def cache_key(self) -> str:
+        return (f"{type(self).__name__}({self.max_shifts_per_staff},{self.pool_slack},"
+                f"{self.day_night_weight},{self.time_budget},{self.block_size},{self.initial.cache_key()})")
+
+    def assign_columns(self, columns, staff):
+        if not len(columns) or not staff:
+            raise ValueError("Missing shifts or staff")
+
+        distinct = list(dict.fromkeys(s.id for s in staff))
+        if self.max_shifts_per_staff is not None and self.max_shifts_per_staff * len(distinct) < len(columns):
+            raise ValueError("Not enough staff capacity to cover every shift")
+
+        starts = _as_list(columns.starts)
+        ends = _as_list(columns.ends)
+        days = _as_list(columns.day_index)
+        signs = [1 if is_day else -1 for is_day in _as_list(columns.is_day)]
+
+        loads = [0] * len(distinct)
+        balance = [0] * len(distinct)
+        owner = [0] * len(columns)
+
+        # Weeks start on Monday, day 0 (1970-01-01) was a Thursday
+        weeks = defaultdict(list)
+        for row, day in enumerate(days):
+            weeks[(day + 3) // 7].append(row)
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        for week in sorted(weeks):
+            for block in self._blocks(weeks[week], starts, ends):
+                if _expired(deadline):
+                    self._fill(block, starts, signs, loads, balance, owner)
+                else:
+                    self._solve_block(block, starts, ends, signs, loads, balance, owner, deadline)
+
+        # Overlaps the groups can't express (across groups or weeks) go to the least loaded free staff
+        assigned = resolve_overlaps(columns, [distinct[position] for position in owner], distinct,
+                                    max_load=self.max_shifts_per_staff, strict=True)
+
+        # One schedule per calendar day, in date order
+        group_of_day = {day: group for group, day in enumerate(sorted(set(days)))}
+        result = AssignmentResult(name=self.schedule_name)
+        result.extend(
+            columns.shifts,
+            assigned,
+            [group_of_day[day] for day in days],
+            [f"Schedule {day_from_index(day)}" for day in sorted(group_of_day)],
+        )
+        return result
+
+    def _blocks(self, rows, starts, ends):
+        # Whole overlap groups in time order, so the one-per-group rule stays exact within a block
+        if self.block_size is None or len(rows) <= self.block_size:
+            return [rows]
+        groups, sizes = overlap_groups(rows, starts, ends)
+        members = [[] for _ in sizes]
+        for row in rows:
+            members[groups[row]].append(row)
+        blocks = [[]]
+        for group in members:
+            if blocks[-1] and len(blocks[-1]) + len(group) > self.block_size:
+                blocks.append([])
+            blocks[-1].extend(group)
+        return blocks
+
+    def _solve_block(self, rows, starts, ends, signs, loads, balance, owner, deadline) -> None:
+        rows = sorted(rows, key=lambda r: (starts[r], r))
+        groups, sizes = overlap_groups(rows, starts, ends)
+
+        # Nobody can take more than one shift per overlap group
+        cap = self.max_shifts_per_staff
+        remaining = [len(sizes) if cap is None else min(len(sizes), cap - load) for load in loads]
+        order = [p for p in sorted(range(len(loads)), key=lambda p: (loads[p], p)) if remaining[p] > 0]
+        if sum(remaining[p] for p in order) < len(rows):
+            raise ValueError("Not enough staff capacity to cover every shift")
+
+        picks = None
+        if self.pool_slack is not None and len(rows) + self.pool_slack < len(order):
+            pool = order[:len(rows) + self.pool_slack]
+            picks = self._flow(rows, groups, sizes, pool, remaining, signs, loads, balance, deadline)
+        if picks is None:
+            picks = self._flow(rows, groups, sizes, order, remaining, signs, loads, balance, deadline)
+        if picks is None:
+            raise ValueError("Not enough staff to cover overlapping shifts")
+
+        unrouted = []
+        for row, position in zip(rows, picks):
+            if position is None:
+                unrouted.append(row)
+                continue
+            owner[row] = position
+            loads[position] += 1
+            balance[position] += signs[row]
+        self._fill(unrouted, starts, signs, loads, balance, owner)
+
+    def _fill(self, rows, starts, signs, loads, balance, owner) -> None:
+        # Out of time: least loaded first, overlaps are left to resolve_overlaps()
+        cap = self.max_shifts_per_staff
+        heap = [(load, position) for position, load in enumerate(loads) if cap is None or load < cap]
+        heapq.heapify(heap)
+        for row in sorted(rows, key=lambda r: (starts[r], r)):
+            load, position = heapq.heappop(heap)
+            owner[row] = position
+            loads[position] += 1
+            balance[position] += signs[row]
+            if cap is None or loads[position] < cap:
+                heapq.heappush(heap, (loads[position], position))
+
+    def _flow(self, rows, groups, sizes, pool, remaining, signs, loads, balance, deadline=None):
+        """Staff position per row, or None if the pool can't cover the rows.
+
+        Rows the flow hadn't routed when the deadline passed get None.
+        """
+        graph = MinCostFlow(2)
+        source, sink = 0, 1
+        slots = {}
+        staff_nodes = {}
+        options = []
+
+        for row in rows:
+            shift_node = graph.add_node()
+            graph.add_edge(source, shift_node, 1, 0)
+            edges = []
+            for position in pool:
+                staff_node = staff_nodes.get(position)
+                if staff_node is None:
+                    staff_node = staff_nodes[position] = graph.add_node()
+                    # Marginal cost of one more shift: (load + 1)^2 - load^2
+                    for extra in range(remaining[position]):
+                        graph.add_edge(staff_node, sink, 1, 2 * (loads[position] + extra) + 1)
+
+                # A shift that overlaps nothing else needs no per-group slot
+                slot = staff_node
+                if sizes[groups[row]] > 1:
+                    slot = slots.get((position, groups[row]))
+                    if slot is None:
+                        slot = slots[position, groups[row]] = graph.add_node()
+                        graph.add_edge(slot, staff_node, 1, 0)
+                penalty = self.day_night_weight if balance[position] * signs[row] > 0 else 0
+                edges.append((graph.add_edge(shift_node, slot, 1, penalty), position))
+            options.append(edges)
+
+        flow, _ = graph.solve(source, sink, len(rows), deadline)
+        if flow < len(rows) and not _expired(deadline):
+            return None
+        return [next((position for edge, position in edges if graph.flow(edge)), None) for edges in options]
+
+    def place(self, state, shift):
+        # Incremental additions fall back to the greedy day/night strategy
+        return self.initial.place(state, shift)
+
+    def group_label(self, shift):
+        return f"Schedule {shift.start_time.date()}"
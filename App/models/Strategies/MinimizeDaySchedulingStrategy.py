@@ -1,40 +1,79 @@
-from App.models import Schedule, ScheduleGroup
 from App.interfaces.ScheduleStrategy import ScheduleStrategy
-from collections import defaultdict
+from App.models.Strategies.AssignmentResult import AssignmentResult
+from App.models.Strategies.OverlapIndex import resolve_overlaps
+from App.models.Strategies.ShiftColumns import day_from_index, numpy
+import heapq
 
-class MinimizeDaySchedulingStrategy(ScheduleStrategy):
 
-    def generateSchedule(self, shifts, staff):
-        if not shifts or not staff:
-            raise ValueError("Missing shifts or staff")
+def assign_days(day_count, staff):
+    """Return the staff member who works each of ``day_count`` consecutive days.
+
+    Every day goes to whoever has the fewest active days so far. A min-heap of
+    (active_day_count, position in staff list) keeps each pick O(log staff) and
+    breaks ties on list position, the same as min() over the list did.
+    """
+    seen = set()
+    heap = []
+    for position, member in enumerate(staff):
+        if member.id not in seen:
+            seen.add(member.id)
+            heap.append((0, position))
+    heapq.heapify(heap)
+
+    picks = []
+    for _ in range(day_count):
+        active, position = heap[0]
+        # Days are distinct, so the picked member gains exactly one active day
+        heapq.heapreplace(heap, (active + 1, position))
+        picks.append(staff[position])
+
+    return picks
+
+
+def minimize_day_kernel(columns, staff):
+    """Give every calendar day, in date order, to the staff with the fewest active days.
 
-        schedule_group = ScheduleGroup(name="Minimal Day Schedule")
+    Returns (staff id per row, group per row, group labels).
+    """
+    if numpy is not None:
+        days, group_index = numpy.unique(columns.day_index, return_inverse=True)
 
-        # Group shifts by day
-        shifts_by_day = defaultdict(list)
-        for shift in shifts:
-            shifts_by_day[shift.start_time.date()].append(shift)
+        # Everyone starts on zero days, so the heap in assign_days hands days out
+        # round-robin over the distinct staff in list order
+        distinct = numpy.fromiter(dict.fromkeys(s.id for s in staff), dtype=numpy.int64)
+        owners = distinct[numpy.arange(len(days)) % len(distinct)]
 
-        # Track the set of days each staff member is already working
-        active_days = defaultdict(set)
-        staff_index = 0
-        staff_count = len(staff)
+        labels = [f"Shifts for {day_from_index(day)}" for day in days]
+        return owners[group_index].tolist(), group_index.tolist(), labels
 
-        # Assign all shifts on a day to a single staff to minimize unique days
-        for day, day_shifts in sorted(shifts_by_day.items()):
-            # Pick staff with the fewest active days so far
-            selected_staff = min(staff, key=lambda s: len(active_days[s.id]))
+    days = sorted(set(columns.day_index))
+    group_of_day = {day: group for group, day in enumerate(days)}
+    owners = [member.id for member in assign_days(len(days), staff)]
+
+    group_index = [group_of_day[day] for day in columns.day_index]
+    labels = [f"Shifts for {day_from_index(day)}" for day in days]
+    return [owners[group] for group in group_index], group_index, labels
+
+
+class MinimizeDaySchedulingStrategy(ScheduleStrategy):
+    schedule_name = "Minimal Day Schedule"
+
+    def assign_columns(self, columns, staff):
+        if not len(columns) or not staff:
+            raise ValueError("Missing shifts or staff")
 
-            # Assign all shifts on this day to selected staff
-            for shift in day_shifts:
-                shift.staff_id = selected_staff.id
-                active_days[selected_staff.id].add(day)
+        result = AssignmentResult(name=self.schedule_name)
 
-            # Build a schedule object for the day
-            schedule = Schedule(name=f"Shifts for {day}", created_by=1)
-            schedule.shifts.extend(day_shifts)
-            schedule_group.add_schedule(schedule)
+        # Assign all shifts on a day to a single staff to minimize unique days,
+        # only shifts overlapping on the same person are handed to someone else
+        assigned, group_index, labels = minimize_day_kernel(columns, staff)
+        result.extend(columns.shifts, resolve_overlaps(columns, assigned, [s.id for s in staff]), group_index, labels)
+        return result
 
-            staff_index += 1
+    def place(self, state, shift):
+        # Keep a day with whoever already works it, otherwise open it for the least busy staff
+        owner = state.day_owner(shift.start_time.date())
+        return owner if owner is not None else state.fewest_active_days().id
 
-        return schedule_group
+    def group_label(self, shift):
+        return f"Shifts for {shift.start_time.date()}"
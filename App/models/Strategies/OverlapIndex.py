@@ -0,0 +1,158 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict, namedtuple
+from typing import Iterable, List, Optional, Sequence
+
+from App.models.Strategies.ShiftColumns import numpy
+
+
+Conflict = namedtuple("Conflict", "staff_id first second")
+
+
+def _as_list(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+class OverlapIndex:
+    """Per-staff sorted interval lists for O(log n) overlap checks.
+
+    Intervals are half-open [start, end), so back-to-back shifts don't clash.
+    A staff member's stored intervals never overlap each other, which keeps
+    both their starts and their ends sorted: the only interval that can clash
+    with a new one is the last one starting before it ends. Start/end can be
+    datetimes or epoch integers, as long as one index doesn't mix them.
+    """
+
+    def __init__(self) -> None:
+        self._starts = defaultdict(list)
+        self._ends = defaultdict(list)
+        self._keys = defaultdict(list)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence]) -> "OverlapIndex":
+        """Build from (staff_id, start, end, key) rows; rows clashing with an earlier one are skipped."""
+        index = cls()
+        for staff_id, start, end, key in sorted(rows, key=lambda row: (row[0], row[1], row[2])):
+            if staff_id is not None:
+                index.add(staff_id, start, end, key)
+        return index
+
+    @classmethod
+    def from_query(cls, query) -> "OverlapIndex":
+        # Only (staff_id, start_time, end_time, id) is selected, no Shift objects are loaded
+        from App.models import Shift
+        return cls.from_rows(query.with_entities(Shift.staff_id, Shift.start_time, Shift.end_time, Shift.id))
+
+    def find(self, staff_id, start, end):
+        """Key of a stored interval of ``staff_id`` overlapping [start, end), or None."""
+        starts = self._starts.get(staff_id)
+        if not starts:
+            return None
+        position = bisect_left(starts, end)
+        if position and self._ends[staff_id][position - 1] > start:
+            return self._keys[staff_id][position - 1]
+        return None
+
+    def is_free(self, staff_id, start, end) -> bool:
+        starts = self._starts.get(staff_id)
+        if not starts:
+            return True
+        position = bisect_left(starts, end)
+        return not position or self._ends[staff_id][position - 1] <= start
+
+    def add(self, staff_id, start, end, key=None) -> bool:
+        """Store the interval unless it overlaps one already stored; returns whether it was added."""
+        if not self.is_free(staff_id, start, end):
+            return False
+        starts = self._starts[staff_id]
+        position = bisect_right(starts, start)
+        starts.insert(position, start)
+        self._ends[staff_id].insert(position, end)
+        self._keys[staff_id].insert(position, key)
+        return True
+
+    def discard(self, staff_id, start, end) -> None:
+        starts = self._starts.get(staff_id)
+        if not starts:
+            return
+        ends = self._ends[staff_id]
+        for position in range(bisect_left(starts, start), bisect_right(starts, start)):
+            if ends[position] == end:
+                del starts[position], ends[position], self._keys[staff_id][position]
+                return
+
+    def forget_before(self, moment) -> None:
+        """Drop intervals that ended by ``moment``, they can't clash with anything later."""
+        for staff_id, ends in self._ends.items():
+            position = bisect_right(ends, moment)
+            if position:
+                del ends[:position], self._starts[staff_id][:position], self._keys[staff_id][:position]
+
+    def __len__(self) -> int:
+        return sum(len(starts) for starts in self._starts.values())
+
+
+def find_conflicts(rows: Iterable[Sequence]) -> List[Conflict]:
+    """Every overlapping pair in (staff_id, start, end, key) rows, in one sort and one sweep.
+
+    Each clashing row is paired with the earlier row of the same staff member
+    that reaches furthest, so a shift overlapping several others shows up once.
+    """
+    conflicts = []
+    current = None
+    reach = reach_key = None
+    for staff_id, start, end, key in sorted(
+            (row for row in rows if row[0] is not None), key=lambda row: (row[0], row[1], row[2])):
+        if staff_id != current:
+            current, reach, reach_key = staff_id, end, key
+            continue
+        if start < reach:
+            conflicts.append(Conflict(staff_id, reach_key, key))
+        if end > reach:
+            reach, reach_key = end, key
+    return conflicts
+
+
+def _has_overlap(assigned, starts, ends) -> bool:
+    # If any two of a staff member's shifts overlap, some pair adjacent in start order does too
+    if numpy is not None:
+        owners, starts, ends = numpy.asarray(assigned), numpy.asarray(starts), numpy.asarray(ends)
+        order = numpy.lexsort((starts, owners))
+        owners, starts, ends = owners[order], starts[order], ends[order]
+        return bool(numpy.any((owners[1:] == owners[:-1]) & (starts[1:] < ends[:-1])))
+
+    order = sorted(range(len(assigned)), key=lambda row: (assigned[row], starts[row]))
+    return any(assigned[a] == assigned[b] and starts[b] < ends[a] for a, b in zip(order, order[1:]))
+
+
+def resolve_overlaps(columns, assigned, staff_ids, max_load: Optional[int] = None, strict: bool = False) -> list:
+    """Move shifts off staff members who already work at that time.
+
+    Walks the rows chronologically against an OverlapIndex and hands each
+    clashing shift to the least loaded staff member who is free then (first
+    in ``staff_ids`` on ties). When nobody is free the shift stays put, or
+    ValueError is raised if ``strict``. Returns the staff id per row.
+    """
+    starts, ends = _as_list(columns.starts), _as_list(columns.ends)
+    assigned = _as_list(assigned)
+    if not _has_overlap(assigned, starts, ends):
+        return assigned
+
+    staff_ids = list(dict.fromkeys(staff_ids))
+    loads = Counter(assigned)
+    index = OverlapIndex()
+    for row in sorted(range(len(assigned)), key=lambda r: (starts[r], ends[r], r)):
+        staff_id = assigned[row]
+        start, end = starts[row], ends[row]
+        if not index.is_free(staff_id, start, end):
+            free = [candidate for candidate in staff_ids
+                    if (max_load is None or loads[candidate] < max_load) and index.is_free(candidate, start, end)]
+            if not free:
+                if strict:
+                    raise ValueError("Not enough staff to cover overlapping shifts")
+                continue
+            target = min(free, key=loads.__getitem__)
+            loads[staff_id] -= 1
+            loads[target] += 1
+            assigned[row] = staff_id = target
+        index.add(staff_id, start, end, row)
+    return assigned
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+
+from App.models import Shift, Staff
+from App.models.Strategies.AssignmentResult import AssignmentResult
+from App.models.Strategies.ShiftColumns import ShiftColumns
+
+
+# Shift attributes a strategy actually reads; staff_id changes come from applying a result
+SCHEDULING_ATTRS = ("start_time", "end_time")
+
+
+class ResultCache:
+    """LRU cache of strategy outputs keyed by a fingerprint of their input.
+
+    The key hashes the strategy's cache_key() with the shift ids, start and
+    end times and the staff ids, all in order. Entries store only the compact
+    arrays of an AssignmentResult, so no ORM objects outlive their session.
+    Eviction is by entry count and by the total number of stored rows.
+    """
+
+    def __init__(self, max_entries: int = 64, max_rows: int = 1000000) -> None:
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(strategy, columns, staff_ids) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(strategy.cache_key().encode())
+        for values in (columns.ids, columns.starts, columns.ends, array("q", staff_ids)):
+            data = values.tobytes()
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def get_or_assign(self, strategy, shifts, staff) -> AssignmentResult:
+        if not shifts or not staff:
+            raise ValueError("Missing shifts or staff")
+
+        staff_ids = [s.id for s in staff]
+        columns = ShiftColumns.from_shifts(shifts)
+        if any(staff_id is None for staff_id in staff_ids):
+            # Unsaved staff can't be fingerprinted reliably
+            return strategy.assign_columns(columns, staff)
+
+        key = self.fingerprint(strategy, columns, staff_ids)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is not None:
+            name, assigned, group_index, labels = entry
+            result = AssignmentResult(name=name)
+            result.extend(columns.shifts, assigned, group_index, list(labels))
+            return result
+
+        result = strategy.assign_columns(columns, staff)
+        self._store(key, result)
+        return result
+
+    def _store(self, key, result) -> None:
+        rows = len(result)
+        if rows > self.max_rows:
+            return
+        entry = (result.name, array("q", result.staff_ids), array("l", result.group_index), tuple(result.group_labels))
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self._rows += rows
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                _, evicted = self._entries.popitem(last=False)
+                self._rows -= len(evicted[1])
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "rows": self._rows,
+            }
+
+
+result_cache = ResultCache()
+
+
+def _invalidate(mapper, connection, target) -> None:
+    result_cache.clear()
+
+
+def _invalidate_on_shift_update(mapper, connection, target) -> None:
+    state = inspect(target)
+    if any(state.attrs[attr].history.has_changes() for attr in SCHEDULING_ATTRS):
+        result_cache.clear()
+
+
+for _model in (Shift, Staff):
+    event.listen(_model, "after_insert", _invalidate, propagate=True)
+    event.listen(_model, "after_delete", _invalidate, propagate=True)
+event.listen(Shift, "after_update", _invalidate_on_shift_update)
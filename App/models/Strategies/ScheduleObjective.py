@@ -0,0 +1,57 @@
+from collections import Counter
+from typing import Dict, Optional
+
+
+def _as_list(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def fairness_variance(result, columns, staff_ids) -> float:
+    """Variance of the number of shifts each staff member got (idle staff count as 0)."""
+    loads = Counter(result.staff_ids)
+    counts = [loads.get(staff_id, 0) for staff_id in staff_ids]
+    mean = sum(counts) / len(counts)
+    return sum((count - mean) ** 2 for count in counts) / len(counts)
+
+
+def working_days(result, columns, staff_ids) -> float:
+    """Average number of distinct days worked per staff member."""
+    worked = set(zip(result.staff_ids, _as_list(columns.day_index)))
+    return len(worked) / len(staff_ids)
+
+
+def day_night_imbalance(result, columns, staff_ids) -> float:
+    """Average |day shifts - night shifts| per staff member."""
+    balance = Counter()
+    for staff_id, is_day in zip(result.staff_ids, _as_list(columns.is_day)):
+        balance[staff_id] += 1 if is_day else -1
+    return sum(abs(value) for value in balance.values()) / len(staff_ids)
+
+
+METRICS = {
+    "fairness": fairness_variance,
+    "working_days": working_days,
+    "day_night": day_night_imbalance,
+}
+
+
+class ScheduleObjective:
+    """Weighted sum of roster metrics, lower is better.
+
+    Rows of the result must line up with the columns it was generated from,
+    which holds for every strategy's assign_columns().
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None) -> None:
+        weights = dict(weights) if weights is not None else {name: 1.0 for name in METRICS}
+        unknown = set(weights) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown objective metric(s): {', '.join(sorted(unknown))}")
+        self.weights = weights
+
+    def breakdown(self, result, columns, staff_ids) -> Dict[str, float]:
+        return {name: METRICS[name](result, columns, staff_ids) for name in self.weights}
+
+    def __call__(self, result, columns, staff_ids) -> float:
+        metrics = self.breakdown(result, columns, staff_ids)
+        return sum(self.weights[name] * value for name, value in metrics.items())
@@ -0,0 +1,139 @@
+import heapq
+from collections import Counter, defaultdict
+from datetime import datetime, time
+from typing import Iterable, Optional, Sequence
+
+from App.models.Strategies.OverlapIndex import OverlapIndex
+
+
+def is_day_shift(start_time) -> bool:
+    return 6 <= start_time.hour < 18   # 6am–6pm is DAY
+
+
+class SchedulingState:
+    """Running per-staff counters for an existing roster.
+
+    Tracks shift loads, day/night balance, active days per staff member and
+    who works each day, so strategies can place added shifts (and forget
+    removed ones) without revisiting the rest of the horizon. The "least
+    loaded" lookups use lazily invalidated heaps keyed like the full
+    strategies, (counter, position in staff list), so ties break the same way.
+    Shifts with an end time also go into an OverlapIndex, so placements can
+    avoid anyone already working at that time.
+    """
+
+    def __init__(self, staff) -> None:
+        if not staff:
+            raise ValueError("Missing staff")
+        self.staff = list(staff)
+        self.positions = {}
+        for position, member in enumerate(self.staff):
+            self.positions.setdefault(member.id, position)
+
+        self.loads = Counter()
+        self.balance = Counter()            # day shifts - night shifts
+        self.active_days = Counter()        # distinct days worked
+        self.day_shifts = Counter()         # shifts per day, any staff
+        self.day_staff = defaultdict(Counter)
+        self.overlaps = OverlapIndex()
+
+        self._balance_heap = [(0, position) for position in self.positions.values()]
+        self._days_heap = list(self._balance_heap)
+        heapq.heapify(self._balance_heap)
+        heapq.heapify(self._days_heap)
+
+    @classmethod
+    def from_assignments(cls, staff, rows: Iterable[Sequence]) -> "SchedulingState":
+        """Build from (staff_id, start_time[, end_time]) rows of the shifts already on the roster."""
+        state = cls(staff)
+        for staff_id, start_time, *end_time in rows:
+            if staff_id is not None:
+                state._count(staff_id, start_time, 1)
+                if end_time:
+                    state.overlaps.add(staff_id, start_time, end_time[0])
+        state._rebuild_heaps()
+        return state
+
+    @classmethod
+    def from_shifts(cls, staff, shifts) -> "SchedulingState":
+        return cls.from_assignments(staff, ((shift.staff_id, shift.start_time, shift.end_time) for shift in shifts))
+
+    def add(self, staff_id: int, start_time, end_time=None) -> None:
+        self._count(staff_id, start_time, 1)
+        if end_time is not None:
+            self.overlaps.add(staff_id, start_time, end_time)
+        self._push(staff_id)
+
+    def remove(self, staff_id: int, start_time, end_time=None) -> None:
+        self._count(staff_id, start_time, -1)
+        if end_time is not None:
+            self.overlaps.discard(staff_id, start_time, end_time)
+        self._push(staff_id)
+
+    def forget_days_before(self, day) -> None:
+        """Drop per-day bookkeeping for days that can no longer receive shifts.
+
+        Per-staff totals are kept, so later placements are unaffected as long
+        as shifts keep arriving in chronological order.
+        """
+        for past in [d for d in self.day_shifts if d < day]:
+            del self.day_shifts[past]
+            self.day_staff.pop(past, None)
+        self.overlaps.forget_before(datetime.combine(day, time.min))
+
+    def day_owner(self, day) -> Optional[int]:
+        working = self.day_staff.get(day)
+        if not working:
+            return None
+        return max(working, key=lambda staff_id: (working[staff_id], -self.positions.get(staff_id, len(self.staff))))
+
+    def least_loaded_free(self, start_time, end_time) -> Optional[int]:
+        """Id of the least loaded staff member not working during [start_time, end_time), if any."""
+        free = [staff_id for staff_id in self.positions if self.overlaps.is_free(staff_id, start_time, end_time)]
+        return min(free, key=lambda staff_id: (self.loads[staff_id], self.positions[staff_id]), default=None)
+
+    def least_imbalanced(self):
+        return self.staff[self._top(self._balance_heap, lambda staff_id: abs(self.balance[staff_id]))]
+
+    def fewest_active_days(self):
+        return self.staff[self._top(self._days_heap, lambda staff_id: self.active_days[staff_id])]
+
+    def _count(self, staff_id: int, start_time, delta: int) -> None:
+        day = start_time.date()
+        self.loads[staff_id] += delta
+        self.balance[staff_id] += delta if is_day_shift(start_time) else -delta
+        self.day_shifts[day] += delta
+
+        working = self.day_staff[day]
+        before = working[staff_id]
+        working[staff_id] += delta
+        if before == 0 and working[staff_id] > 0:
+            self.active_days[staff_id] += 1
+        elif before > 0 and working[staff_id] <= 0:
+            self.active_days[staff_id] -= 1
+            del working[staff_id]
+            if not working:
+                del self.day_staff[day]
+
+    def _push(self, staff_id: int) -> None:
+        position = self.positions.get(staff_id)
+        if position is None:
+            return
+        heapq.heappush(self._balance_heap, (abs(self.balance[staff_id]), position))
+        heapq.heappush(self._days_heap, (self.active_days[staff_id], position))
+        if len(self._balance_heap) > 4 * len(self.positions) + 64:
+            self._rebuild_heaps()
+
+    def _top(self, heap, key) -> int:
+        # Drop entries whose counter has moved on since they were pushed
+        while True:
+            value, position = heap[0]
+            if key(self.staff[position].id) == value:
+                return position
+            heapq.heappop(heap)
+
+    def _rebuild_heaps(self) -> None:
+        self._balance_heap = [(abs(self.balance[staff_id]), position) for staff_id, position in self.positions.items()]
+        self._days_heap = [(self.active_days[staff_id], position) for staff_id, position in self.positions.items()]
+        heapq.heapify(self._balance_heap)
+        heapq.heapify(self._days_heap)
@@ -0,0 +1,88 @@
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from App.models import Shift
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, the kernels fall back to pure Python
+    numpy = None
+
+
+EPOCH = datetime(1970, 1, 1)
+HOUR_US = 3600 * 1000000
+DAY_US = 24 * HOUR_US
+
+
+def to_epoch_us(value: datetime) -> int:
+    # Wall-clock microseconds, so day/hour buckets match value.date() and value.hour
+    return (value.replace(tzinfo=None) - EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_us(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+def day_from_index(day_index: int):
+    return (EPOCH + timedelta(days=int(day_index))).date()
+
+
+class ShiftColumns:
+    """Columnar view of a batch of shifts for the strategy kernels.
+
+    Holds parallel arrays of shift ids, start and end times (epoch
+    microseconds), day indices (days since epoch) and day/night flags (6am-6pm
+    is DAY). They are NumPy arrays when NumPy is installed and plain
+    arrays/lists otherwise.
+    ``shifts`` keeps whatever the columns were built from: Shift objects, or
+    shift ids when built straight from a query.
+    """
+
+    __slots__ = ("shifts", "ids", "starts", "ends", "day_index", "is_day")
+
+    def __init__(self, shifts: Sequence, ids: Sequence[int], starts: Sequence[int],
+                 ends: Optional[Sequence[int]] = None) -> None:
+        self.shifts = shifts
+        if ends is None:
+            ends = starts
+        if numpy is not None:
+            self.ids = numpy.asarray(ids, dtype=numpy.int64)
+            self.starts = numpy.asarray(starts, dtype=numpy.int64)
+            self.ends = numpy.asarray(ends, dtype=numpy.int64)
+            self.day_index = self.starts // DAY_US
+            hours = (self.starts % DAY_US) // HOUR_US
+            self.is_day = (hours >= 6) & (hours < 18)
+        else:
+            self.ids = array("q", ids)
+            self.starts = array("q", starts)
+            self.ends = array("q", ends)
+            self.day_index = array("q", (start // DAY_US for start in self.starts))
+            self.is_day = [6 <= (start % DAY_US) // HOUR_US < 18 for start in self.starts]
+
+    @classmethod
+    def from_shifts(cls, shifts: Sequence[Shift]) -> "ShiftColumns":
+        # Unsaved shifts have no id yet, -1 stands in for them
+        ids = [shift.id if shift.id is not None else -1 for shift in shifts]
+        starts = [to_epoch_us(shift.start_time) for shift in shifts]
+        ends = [to_epoch_us(shift.end_time) for shift in shifts]
+        return cls(list(shifts), ids, starts, ends)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, datetime, datetime]]) -> "ShiftColumns":
+        ids: List[int] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        for shift_id, start_time, end_time in rows:
+            ids.append(shift_id)
+            starts.append(to_epoch_us(start_time))
+            ends.append(to_epoch_us(end_time))
+        return cls(list(ids), ids, starts, ends)
+
+    @classmethod
+    def from_query(cls, query) -> "ShiftColumns":
+        # Only (id, start_time, end_time) is selected, no Shift objects are loaded
+        return cls.from_rows(query.with_entities(Shift.id, Shift.start_time, Shift.end_time))
+
+    def __len__(self) -> int:
+        return len(self.shifts)
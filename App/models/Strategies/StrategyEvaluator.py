@@ -0,0 +1,118 @@
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from App.models.Strategies.AssignmentResult import AssignmentResult
+from App.models.Strategies.ScheduleObjective import ScheduleObjective
+from App.models.Strategies.ShiftColumns import ShiftColumns
+
+
+# Stand-in for Staff inside worker processes, kernels only read .id
+StaffRef = namedtuple("StaffRef", "id")
+
+Evaluation = namedtuple("Evaluation", "name result scores")
+
+# One pool per process, shared by every evaluation, so web workers don't fork a fresh set per request
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _shared_pool() -> ProcessPoolExecutor:
+    global _pool, _pool_pid
+    with _pool_lock:
+        # Created on first use, and again after a fork, so each worker process gets its own
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _discard_pool(pool) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _run_strategy(strategy, ids, starts, ends, staff_ids):
+    columns = ShiftColumns(ids, ids, starts, ends)
+    result = strategy.assign_columns(columns, [StaffRef(staff_id) for staff_id in staff_ids])
+    return result.name, result.staff_ids.tolist(), result.group_index.tolist(), result.group_labels
+
+
+class StrategyEvaluator:
+    """Run several strategies on the same input and keep the best-scoring result.
+
+    Strategies run side by side in a process pool shared by the whole process
+    (at most one worker per CPU), so wall time tracks the slowest strategy
+    rather than the sum. Small inputs, or environments where a pool can't
+    start, run the strategies one after another instead.
+    """
+
+    def __init__(
+        self,
+        strategies: Dict[str, object],
+        objective: Optional[ScheduleObjective] = None,
+        max_workers: Optional[int] = None,
+        min_parallel_shifts: int = 1000,
+    ) -> None:
+        if not strategies:
+            raise ValueError("At least one strategy is required")
+        self.strategies = strategies
+        self.objective = objective or ScheduleObjective()
+        self.max_workers = max_workers or min(len(strategies), os.cpu_count() or 1)
+        self.min_parallel_shifts = min_parallel_shifts
+
+    def evaluate(self, shifts, staff, parallel: bool = True) -> Evaluation:
+        if not shifts or not staff:
+            raise ValueError("Missing shifts or staff")
+
+        columns = ShiftColumns.from_shifts(shifts)
+        staff_ids = [s.id for s in staff]
+
+        outputs = None
+        if parallel and self.max_workers > 1 and len(columns) >= self.min_parallel_shifts:
+            outputs = self._run_parallel(columns, staff_ids)
+        if outputs is None:
+            outputs = {
+                name: _run_strategy(strategy, columns.ids, columns.starts, columns.ends, staff_ids)
+                for name, strategy in self.strategies.items()
+            }
+
+        best = None
+        scores = {}
+        distinct_staff = list(dict.fromkeys(staff_ids))
+        for name in self.strategies:
+            result_name, assigned, group_index, labels = outputs[name]
+            result = AssignmentResult(name=result_name)
+            result.extend(columns.shifts, assigned, group_index, labels)
+
+            scores[name] = self.objective(result, columns, distinct_staff)
+            # Ties go to the earlier registered strategy
+            if best is None or scores[name] < scores[best.name]:
+                best = Evaluation(name, result, scores)
+
+        return best
+
+    def _run_parallel(self, columns, staff_ids):
+        ids = columns.ids.tolist()
+        starts = columns.starts.tolist()
+        ends = columns.ends.tolist()
+        pool = None
+        try:
+            pool = _shared_pool()
+            futures = {
+                name: pool.submit(_run_strategy, strategy, ids, starts, ends, staff_ids)
+                for name, strategy in self.strategies.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+        except (OSError, BrokenProcessPool):
+            # A dead pool is replaced on the next call
+            if pool is not None:
+                _discard_pool(pool)
+            return None
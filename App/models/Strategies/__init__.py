@@ -1,3 +1,11 @@
+from .AssignmentResult import AssignmentResult
 from .DayNightBalancedScheduling import DayNightBalancedScheduling
 from .EvenDistributionStrategy import EvenDistributionStrategy
 from .MinimizeDaySchedulingStrategy import MinimizeDaySchedulingStrategy
+from .LocalSearchStrategy import LocalSearchStrategy
+from .MinCostFlowStrategy import MinCostFlowStrategy
+from .ScheduleObjective import ScheduleObjective
+from .StrategyEvaluator import StrategyEvaluator
+from .ResultCache import ResultCache, result_cache
+from .SchedulingState import SchedulingState
+from .OverlapIndex import OverlapIndex, find_conflicts, resolve_overlaps
@@ -2,6 +2,9 @@ from datetime import datetime
 from App.database import db
 
 class Notification(db.Model):
+    # A user's notifications, newest first
+    __table_args__ = (db.Index("ix_notification_receiver_id_timestamp", "receiver_id", "timestamp"),)
+
     id = db.Column(db.Integer, primary_key=True)
     receiver_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     message = db.Column(db.String(255), nullable=False)
@@ -1,16 +1,38 @@
 from datetime import datetime
-from App.database import db
+from sqlalchemy import func, insert_sentinel, select
+from sqlalchemy.orm import column_property, selectinload
+from App.database import db, expire_counter_on_flush
+from App.models.shift import Shift
 
 class Schedule(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
-    schedule_group_id = db.Column(db.Integer, db.ForeignKey("schedule_group.id"), nullable=True)
+    schedule_group_id = db.Column(db.Integer, db.ForeignKey("schedule_group.id"), nullable=True, index=True)
+    # Lets a bulk INSERT ... RETURNING hand back its rows in parameter order in one
+    # statement on backends (SQLite) that can't order them by the primary key
+    _insert_sentinel = insert_sentinel("insert_sentinel")
     shifts = db.relationship("Shift", backref="schedule", lazy=True)
+    # Counted in the SELECT that loads the schedule (one index range scan), no shift rows are loaded
+    shift_total = column_property(
+        select(func.count(Shift.id)).where(Shift.schedule_id == id).correlate_except(Shift).scalar_subquery()
+    )
+
+    @staticmethod
+    def json_loader():
+        """Loader option for everything get_json() reads.
+
+        The shifts of every loaded schedule come in one SELECT ... IN with
+        their staff joined, instead of a query per schedule and per shift.
+        """
+        return selectinload(Schedule.shifts).options(Shift.json_loader())
 
     def shift_count(self):
-        return len(self.shifts)
+        # Shifts already in memory may include unflushed changes, otherwise use the counter
+        if "shifts" in self.__dict__:
+            return len(self.shifts)
+        return self.shift_total or 0
 
     def get_json(self):
         return {
@@ -23,3 +45,4 @@ class Schedule(db.Model):
         }
 
 
+expire_counter_on_flush(Shift, "schedule_id", Schedule, "shift_total")
@@ -1,7 +1,18 @@
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 from App.database import db
 
 class Shift(db.Model):
+    # Hot lookups, each checked by `flask explain-hot`
+    __table_args__ = (
+        # per-staff roster windows and overlap checks: staff_id = ? AND start_time >= ?
+        db.Index("ix_shift_staff_id_start_time", "staff_id", "start_time"),
+        # a schedule's shifts in time order
+        db.Index("ix_shift_schedule_id_start_time", "schedule_id", "start_time"),
+        # reports and strategy inputs ordered by start_time
+        db.Index("ix_shift_start_time", "start_time"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     staff_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
     schedule_id = db.Column(db.Integer, db.ForeignKey("schedule.id"), nullable=True)
@@ -12,6 +23,11 @@ class Shift(db.Model):
 
     staff = db.relationship("Staff", backref="shifts", foreign_keys=[staff_id])
 
+    @staticmethod
+    def json_loader():
+        """Loader option for get_json(): each shift's staff member is joined in, not fetched per shift."""
+        return joinedload(Shift.staff)
+
     def get_json(self):
         return {
             "id": self.id,
@@ -1,5 +1,5 @@
-from werkzeug.security import check_password_hash, generate_password_hash
 from App.database import db
+from App.passwords import get_password_hasher
 from datetime import datetime
 
 class User(db.Model):
@@ -27,9 +27,12 @@ class User(db.Model):
         }
 
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = get_password_hasher().hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        return get_password_hasher().check(self.password, password)
+
+    def password_needs_rehash(self):
+        return get_password_hasher().needs_rehash(self.password)
 
 
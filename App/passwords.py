@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+try:
+    from gevent import monkey as gevent_monkey
+    from gevent.threadpool import ThreadPool as GeventThreadPool
+except ImportError:  # gevent is only needed under the gevent gunicorn worker
+    gevent_monkey = None
+
+# PASSWORD_HASH_METHOD schemes and werkzeug's defaults for their parameters
+PASSWORD_HASH_DEFAULTS = {
+    "scrypt": ("32768", "8", "1"),
+    "pbkdf2": ("sha256", str(DEFAULT_PBKDF2_ITERATIONS)),
+}
+
+
+def full_method(method):
+    """method with werkzeug's defaults filled in, as it is written at the start of a hash.
+
+    "scrypt" is "scrypt:32768:8:1", "pbkdf2:sha512" is "pbkdf2:sha512:<default iterations>".
+    """
+    name, *args = method.split(":")
+    defaults = PASSWORD_HASH_DEFAULTS.get(name)
+    if defaults is None or len(args) > len(defaults):
+        raise ValueError(f"PASSWORD_HASH_METHOD must be scrypt[:n:r:p] or pbkdf2[:hash[:iterations]], not {method!r}")
+    return ":".join([name, *args, *defaults[len(args):]])
+
+
+class PasswordHasher:
+    """Hashes and checks passwords with the configured method on a bounded pool of threads.
+
+    hashlib releases the GIL while it works, so a login no longer holds up
+    the calling thread's peers, and under the gevent worker the hashing
+    runs on native threads instead of blocking the event loop. At most
+    `workers` hashes run at once, further logins wait their turn. With
+    workers=0 everything runs inline on the caller.
+    """
+
+    def __init__(self, method="scrypt", salt_length=16, workers=4) -> None:
+        self.method = full_method(method)
+        self.salt_length = salt_length
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if self._pool is None:
+            with self._lock:
+                # Created on first use, so each forked worker process gets its own threads
+                if self._pool is None:
+                    if gevent_monkey is not None and gevent_monkey.is_module_patched("threading"):
+                        # Patched threading would give greenlets, gevent's pool has real threads
+                        self._pool = GeventThreadPool(self.workers)
+                    else:
+                        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="password")
+        if isinstance(self._pool, ThreadPoolExecutor):
+            return self._pool.submit(fn, *args).result()
+        return self._pool.apply(fn, args)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def check(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """Whether pwhash was made with another method, other parameters or another salt length."""
+        method, _, rest = pwhash.partition("$")
+        salt = rest.partition("$")[0]
+        return method != self.method or len(salt) != self.salt_length
+
+    def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if isinstance(pool, ThreadPoolExecutor):
+            pool.shutdown()
+        elif pool is not None:
+            pool.kill()
+
+
+# Outside an app (scripts, unit tests on bare models): werkzeug's defaults, hashed inline
+_default_hasher = PasswordHasher(workers=0)
+
+
+def init_password_hasher(app):
+    hasher = PasswordHasher(
+        method=app.config.setdefault("PASSWORD_HASH_METHOD", "scrypt"),
+        salt_length=int(app.config.setdefault("PASSWORD_SALT_LENGTH", 16)),
+        workers=int(app.config.setdefault("PASSWORD_HASH_WORKERS", 4)),
+    )
+    app.extensions["password_hasher"] = hasher
+    return hasher
+
+
+def get_password_hasher():
+    if has_app_context():
+        hasher = current_app.extensions.get("password_hasher")
+        if hasher is not None:
+            return hasher
+    return _default_hasher
@@ -1,12 +1,13 @@
 import unittest, pytest
 from datetime import datetime, timedelta
-from App.controllers.admin import auto_populate_schedule
+from App.controllers.admin import auto_populate_schedule, reschedule_group, iter_shift_windows, stream_populate_schedule
 from App.controllers.user import get_user
 from App.database import db
 from App.models import User, Schedule
-from App.controllers import create_user, schedule_shift, get_shift_report, get_combined_roster
+from App.controllers import create_user, update_user, schedule_shift, get_shift_report, get_combined_roster, stream_shift_report, explain_hot_queries
 from App.models.ScheduleGroup import ScheduleGroup
 from App.models.shift import Shift
+from App.models.GroupRosterFactory import GroupRosterFactory
 
 class AdminTests(unittest.TestCase):
     """Unit + Integration tests for Admin functionality"""
@@ -163,6 +164,266 @@ class AdminTests(unittest.TestCase):
         with self.assertRaises(PermissionError):
             get_shift_report(staff.id)
 
+    @pytest.mark.unit
+    def test_streamed_shift_report_matches_report(self):
+        import csv, io, json
+        admin = create_user("stream_admin", "adminpass", "admin")
+        staff = create_user("stream_staff", "staffpass", "staff")
+        schedule = Schedule(name="Streamed", created_by=admin.id)
+        db.session.add(schedule)
+        db.session.commit()
+        base = datetime(2025, 3, 3, 8)
+        for day in range(5):
+            schedule_shift(admin.id, staff, schedule, base + timedelta(days=day), base + timedelta(days=day, hours=8))
+        db.session.add(Shift(start_time=base + timedelta(days=9), end_time=base + timedelta(days=9, hours=8)))
+        db.session.commit()
+
+        expected = get_shift_report(admin.id)
+        ndjson = "".join(stream_shift_report(admin.id, "ndjson", batch_size=2))
+        self.assertEqual([json.loads(line) for line in ndjson.splitlines()], expected)
+
+        rows = list(csv.DictReader(io.StringIO("".join(stream_shift_report(admin.id, "csv", batch_size=2)))))
+        self.assertEqual([row["id"] for row in rows], [str(shift["id"]) for shift in expected])
+        self.assertEqual(rows[0]["staff_name"], "stream_staff")
+        self.assertEqual(rows[-1]["staff_id"], "")
+
+        with self.assertRaises(PermissionError):
+            stream_shift_report(staff.id)
+        with self.assertRaises(ValueError):
+            stream_shift_report(admin.id, "xml")
+
+    @pytest.mark.unit
+    def test_hot_queries_are_served_by_indexes(self):
+        plans = explain_hot_queries()
+        self.assertTrue(plans)
+        for plan in plans:
+            self.assertEqual(plan.problems, [], f"{plan.name}: {plan.plan}")
+
+    @pytest.mark.integration
+    def test_group_json_uses_fixed_number_of_queries(self):
+        from sqlalchemy import event
+        admin = create_user("json_admin", "adminpass", "admin")
+        staff = [create_user(f"json_staff{i}", "pass", "staff") for i in range(4)]
+        group = ScheduleGroup(name="Json Group")
+        db.session.add(group)
+        base = datetime(2025, 7, 7, 8)
+        for day in range(20):
+            schedule = Schedule(name=f"Day {day}", created_by=admin.id)
+            group.schedules.append(schedule)
+            for slot in range(5):
+                start = base + timedelta(days=day, hours=slot)
+                schedule.shifts.append(Shift(staff_id=staff[slot % 4].id, start_time=start, end_time=start + timedelta(hours=1)))
+        db.session.commit()
+        group_id = group.id
+        db.session.expunge_all()
+        lazy = db.session.get(ScheduleGroup, group_id).get_json()
+        db.session.expunge_all()
+
+        statements = []
+        count = lambda *args: statements.append(args[2])
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            eager = ScheduleGroup.get_for_json(group_id).get_json()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+
+        # group, schedules, shifts joined to staff
+        self.assertEqual(len(statements), 3, statements)
+        self.assertEqual(eager, lazy)
+        self.assertEqual(eager["schedule_count"], 20)
+        self.assertEqual(eager["schedules"][0]["shifts"][0]["staff_name"], "json_staff0")
+
+    @pytest.mark.integration
+    def test_shift_counters_track_insert_delete_and_reassign(self):
+        admin = create_user("count_admin", "adminpass", "admin")
+        staff = create_user("count_staff", "staffpass", "staff")
+        group = ScheduleGroup(name="Counted")
+        first, second = Schedule(name="First", created_by=admin.id), Schedule(name="Second", created_by=admin.id)
+        group.schedules.extend([first, second])
+        db.session.add(group)
+        db.session.commit()
+        base = datetime(2025, 9, 1, 8)
+        for day in range(3):
+            schedule_shift(admin.id, staff, first, base + timedelta(days=day), base + timedelta(days=day, hours=8))
+        ids = first.id, second.id, group.id
+        admin_id = admin.id
+        db.session.expunge_all()
+
+        first, second, group = db.session.get(Schedule, ids[0]), db.session.get(Schedule, ids[1]), db.session.get(ScheduleGroup, ids[2])
+        self.assertEqual((first.shift_count(), second.shift_count(), group.schedule_count()), (3, 0, 2))
+        self.assertNotIn("shifts", first.__dict__)
+        self.assertNotIn("schedules", group.__dict__)
+
+        # Reassign one shift and delete another without touching either collection
+        moved, dropped = Shift.query.filter_by(schedule_id=ids[0]).order_by(Shift.start_time).limit(2).all()
+        moved.schedule_id = ids[1]
+        db.session.delete(dropped)
+        db.session.add(Schedule(name="Third", created_by=admin_id, schedule_group_id=ids[2]))
+        db.session.flush()
+        self.assertEqual((first.shift_count(), second.shift_count(), group.schedule_count()), (1, 1, 3))
+        self.assertNotIn("shifts", first.__dict__)
+        db.session.commit()
+
+    @pytest.mark.integration
+    def test_view_schedule_page_loads_selected_schedule_in_fixed_queries(self):
+        from flask import current_app
+        from sqlalchemy import event
+        from flask_jwt_extended import create_access_token
+        admin = create_user("view_admin", "adminpass", "admin")
+        staff = create_user("view_staff", "staffpass", "staff")
+        schedules = [Schedule(name=f"View {i}", created_by=admin.id) for i in range(5)]
+        db.session.add_all(schedules)
+        db.session.commit()
+        base = datetime(2025, 8, 4, 8)
+        for i, schedule in enumerate(schedules):
+            for slot in range(i + 1):
+                start = base + timedelta(days=i, hours=slot)
+                db.session.add(Shift(staff_id=staff.id, schedule_id=schedule.id, start_time=start, end_time=start + timedelta(hours=1)))
+        db.session.commit()
+        selected_id = schedules[3].id
+        token = create_access_token(identity=str(admin.id))
+        db.session.expunge_all()
+
+        statements = []
+        count = lambda *args: statements.append(args[2])
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            response = current_app.test_client().get(f"/viewSchedule?schedule_id={selected_id}",
+                                                     headers={"Authorization": f"Bearer {token}"})
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+
+        page = response.get_data(as_text=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Total Shifts: 4", page)
+        self.assertEqual(page.count("view_staff"), 4)
+        # schedules with counts, the selected schedule, its shifts joined to staff
+        self.assertLessEqual(len([s for s in statements if "FROM schedule" in s or "FROM shift" in s]), 3, statements)
+
+    @pytest.mark.integration
+    def test_lazy_load_guard_flags_unplanned_lazy_loads(self):
+        from flask import current_app
+        from App.database import LazyLoadError
+        admin = create_user("guard_admin", "adminpass", "admin")
+        staff = create_user("guard_staff", "staffpass", "staff")
+        schedule = Schedule(name="Guarded", created_by=admin.id)
+        db.session.add(schedule)
+        db.session.commit()
+        schedule_shift(admin.id, staff, schedule, datetime(2025, 8, 1, 8), datetime(2025, 8, 1, 16))
+        schedule_id, admin_id, staff_id = schedule.id, admin.id, staff.id
+        db.session.expunge_all()
+
+        current_app.config["LAZY_LOAD_GUARD"] = "raise"
+        try:
+            with self.assertRaises(LazyLoadError):
+                db.session.get(Schedule, schedule_id).get_json()
+            db.session.expunge_all()
+
+            # The planned paths eager-load what they serialise
+            self.assertEqual(len(db.session.get(Schedule, schedule_id, options=[Schedule.json_loader()]).get_json()["shifts"]), 1)
+            db.session.expunge_all()
+            self.assertEqual(get_shift_report(admin_id)[0]["staff_name"], "guard_staff")
+            db.session.expunge_all()
+            self.assertEqual(get_combined_roster(staff_id)[0]["staff_name"], "guard_staff")
+        finally:
+            current_app.config["LAZY_LOAD_GUARD"] = "off"
+
+    @pytest.mark.integration
+    def test_request_loads_caller_once_and_checks_role(self):
+        from flask import current_app
+        from sqlalchemy import event
+        from flask_jwt_extended import create_access_token
+        admin = create_user("identity_admin", "adminpass", "admin")
+        staff = create_user("identity_staff", "staffpass", "staff")
+        admin_token = create_access_token(identity=str(admin.id))
+        staff_token = create_access_token(identity=str(staff.id))
+        client = current_app.test_client()
+        principals = current_app.extensions["principal_cache"]
+        principals.clear()
+        db.session.expunge_all()
+
+        user_selects = []
+        count = lambda conn, cursor, statement, *args: user_selects.append(statement) \
+            if statement.startswith("SELECT") and "FROM user" in statement else None
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            for _ in range(2):
+                response = client.get("/shiftReport/export", headers={"Authorization": f"Bearer {admin_token}"})
+                response.get_data()
+                self.assertEqual(response.status_code, 200)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        # The JWT user lookup, the role decorator and the controller's role check share one load,
+        # and the next request is answered by the principal cache
+        self.assertEqual(len(user_selects), 1, user_selects)
+
+        response = client.get("/shiftReport/export", headers={"Authorization": f"Bearer {staff_token}"})
+        self.assertEqual(response.status_code, 403)
+
+    @pytest.mark.integration
+    def test_cache_stats_route_reports_this_process(self):
+        from flask import current_app
+        from flask_jwt_extended import create_access_token
+        from App.models.Strategies import EvenDistributionStrategy, result_cache
+        admin = create_user("stats_admin", "adminpass", "admin")
+        staff = create_user("stats_staff", "staffpass", "staff")
+        admin_token = create_access_token(identity=str(admin.id))
+        staff_token = create_access_token(identity=str(staff.id))
+        client = current_app.test_client()
+
+        shifts = [Shift(id=1, start_time=datetime(2025, 6, 2, 8), end_time=datetime(2025, 6, 2, 16))]
+        for _ in range(2):
+            result_cache.get_or_assign(EvenDistributionStrategy(), shifts, [staff])
+
+        response = client.get("/admin/cache-stats", headers={"Authorization": f"Bearer {admin_token}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), result_cache.stats())
+        self.assertGreaterEqual(response.get_json()["hits"], 1)
+
+        response = client.get("/admin/cache-stats", headers={"Authorization": f"Bearer {staff_token}"})
+        self.assertEqual(response.status_code, 403)
+
+    @pytest.mark.unit
+    def test_principal_cache_lru_ttl_and_write_through(self):
+        import tempfile, os
+        from flask import current_app
+        from App.controllers.principal_cache import MemoryPrincipalCache, SQLitePrincipalCache
+        from App.controllers.auth import logout
+
+        now = [0.0]
+        cache = MemoryPrincipalCache(max_entries=2, ttl=10, clock=lambda: now[0])
+        cache.set(1, (1, "a", "staff"))
+        cache.set(2, (2, "b", "staff"))
+        cache.get(1)
+        cache.set(3, (3, "c", "admin"))
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), (1, "a", "staff"))
+        now[0] = 11
+        self.assertIsNone(cache.get(1))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "principals.sqlite3")
+            shared, other_worker = SQLitePrincipalCache(path, max_entries=2), SQLitePrincipalCache(path, max_entries=2)
+            shared.set(1, (1, "a", "staff"))
+            self.assertEqual(other_worker.get(1), (1, "a", "staff"))
+            other_worker.delete(1)
+            self.assertIsNone(shared.get(1))
+            for user_id in range(2, 6):
+                shared.set(user_id, (user_id, "u", "staff"))
+            self.assertIsNone(shared.get(2))
+            self.assertEqual(shared.get(5), (5, "u", "staff"))
+
+        # Writes through the session replace the cached principal once committed
+        principals = current_app.extensions["principal_cache"]
+        user = create_user("cached_user", "pass", "staff")
+        self.assertEqual(principals.get(user.id), (user.id, "cached_user", "staff"))
+        update_user(user.id, "renamed_user")
+        self.assertEqual(principals.get(user.id), (user.id, "renamed_user", "staff"))
+        user.active_token = "token"
+        db.session.commit()
+        logout("renamed_user")
+        self.assertIsNone(principals.get(user.id))
+
     @pytest.mark.integration
     def test_auto_populate_valid(self):
         admin = create_user("auto_admin", "adminpass", "admin")
@@ -192,4 +453,183 @@ class AdminTests(unittest.TestCase):
 
         staff_ids = {s.staff_id for s in generated_shifts}
         self.assertTrue(any(sid in (staff1.id, staff2.id) for sid in staff_ids))
-        self.assertGreaterEqual(len(generated_shifts), 2)
\ No newline at end of file
+        self.assertGreaterEqual(len(generated_shifts), 2)
+
+    @pytest.mark.integration
+    def test_reschedule_group_places_only_new_shifts(self):
+        admin = create_user("inc_admin", "adminpass", "admin")
+        create_user("incA", "passA", "staff")
+        create_user("incB", "passB", "staff")
+
+        schedule_group = ScheduleGroup(name="Incremental Group")
+        db.session.add(schedule_group)
+        db.session.commit()
+
+        shifts = [Shift(start_time=datetime(2025, 10, 24 + i, 8, 0, 0),
+                        end_time=datetime(2025, 10, 24 + i, 16, 0, 0)) for i in range(3)]
+        auto_populate_schedule(admin.id, schedule_group.id, shifts, "minimize_day")
+        before = {s.id: s.staff_id for s in shifts}
+
+        extra = Shift(start_time=datetime(2025, 10, 25, 18, 0, 0), end_time=datetime(2025, 10, 25, 23, 0, 0))
+        changes = reschedule_group(admin.id, schedule_group.id, "minimize_day", added=[extra], removed=[shifts[2]])
+
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(extra.staff_id, shifts[1].staff_id)
+        self.assertIsNone(shifts[2].staff_id)
+        self.assertEqual({s.id: s.staff_id for s in shifts[:2]}, {k: before[k] for k in list(before)[:2]})
+
+        other_group = ScheduleGroup(name="Other Group")
+        db.session.add(other_group)
+        db.session.commit()
+        with self.assertRaises(ValueError):
+            reschedule_group(admin.id, other_group.id, "minimize_day", removed=[shifts[0]])
+        with self.assertRaises(ValueError):
+            reschedule_group(admin.id, schedule_group.id, "minimize_day", removed=[shifts[2]])  # already removed
+        self.assertEqual(shifts[0].staff_id, before[shifts[0].id])
+
+    @pytest.mark.integration
+    def test_stream_populate_matches_single_pass(self):
+        admin = create_user("stream_admin", "adminpass", "admin")
+        staff = [create_user(f"stream{i}", "pass", "staff") for i in range(3)]
+        start, end = datetime(2025, 1, 1), datetime(2025, 1, 20)
+
+        schedule_group = ScheduleGroup(name="Streamed Group")
+        db.session.add(schedule_group)
+        db.session.commit()
+
+        windows = list(iter_shift_windows(start, end, window_days=7))
+        self.assertEqual([len(w) for w in windows], [21, 21, 14])
+
+        expected = GroupRosterFactory().get_strategy("day_night_balanced") \
+            .assign([s for w in iter_shift_windows(start, end) for s in w], staff)
+        # As in a fresh CLI process, the group is loaded from the database rather than built here
+        group_id, admin_id = schedule_group.id, admin.id
+        db.session.expunge_all()
+        total = stream_populate_schedule(admin_id, group_id, iter(windows), "day_night_balanced")
+        schedule_group = db.session.get(ScheduleGroup, group_id)
+
+        self.assertEqual(total, 56)
+        stored = db.session.query(Shift.start_time, Shift.staff_id).join(Schedule) \
+            .filter(Schedule.schedule_group_id == schedule_group.id).order_by(Shift.start_time).all()
+        self.assertEqual([staff_id for _, staff_id in stored], list(expected.staff_ids))
+
+        db.session.expunge_all()
+        extra = [Shift(start_time=datetime(2025, 2, 1, 8), end_time=datetime(2025, 2, 1, 16))]
+        self.assertEqual(len(auto_populate_schedule(admin_id, group_id, extra, "even_distribution").observers), 3)
+
+    @pytest.mark.integration
+    def test_schedule_shift_rejects_overlap_and_group_scan_finds_clashes(self):
+        admin = create_user("overlap_admin", "adminpass", "admin")
+        staff = create_user("overlap_staff", "pass", "staff")
+        schedule_group = ScheduleGroup(name="Overlap Group")
+        db.session.add(schedule_group)
+        db.session.commit()
+        schedule = Schedule(name="Overlap Schedule", created_by=admin.id, schedule_group_id=schedule_group.id)
+        db.session.add(schedule)
+        db.session.commit()
+
+        first = schedule_shift(admin.id, staff, schedule, datetime(2025, 11, 3, 8), datetime(2025, 11, 3, 16))
+        schedule_shift(admin.id, staff, schedule, datetime(2025, 11, 3, 16), datetime(2025, 11, 3, 22))
+        with self.assertRaises(ValueError):
+            schedule_shift(admin.id, staff, schedule, datetime(2025, 11, 3, 12), datetime(2025, 11, 3, 20))
+        self.assertEqual(schedule_group.find_conflicts(), [])
+
+        # Rows written behind the controller's back are caught by the group scan
+        clash = Shift(staff_id=staff.id, schedule_id=schedule.id,
+                      start_time=datetime(2025, 11, 3, 10), end_time=datetime(2025, 11, 3, 12))
+        db.session.add(clash)
+        db.session.commit()
+        self.assertEqual([(c.staff_id, c.first, c.second) for c in schedule_group.find_conflicts()],
+                         [(staff.id, first.id, clash.id)])
+
+    @pytest.mark.integration
+    def test_bulk_persist_round_trips_do_not_grow_with_shifts(self):
+        from sqlalchemy import event
+        from App.models.Strategies import DayNightBalancedScheduling
+        from App.models.Strategies.ShiftColumns import ShiftColumns
+
+        admin = create_user("bulk_admin", "adminpass", "admin")
+        staff = [create_user(f"bulk{i}", "pass", "staff") for i in range(3)]
+        base = datetime(2025, 6, 2)
+        db.session.add_all(Shift(start_time=base + timedelta(hours=8 * i), end_time=base + timedelta(hours=8 * i + 8))
+                           for i in range(60))
+        db.session.commit()
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            shifts = Shift.query.order_by(Shift.start_time).all()
+            created_by = admin.id
+            [member.id for member in staff]  # refresh after the commits above
+            statements.clear()
+            result = DayNightBalancedScheduling().assign(shifts, staff)
+            schedules = result.persist(created_by=created_by)
+            db.session.commit()
+            persist_trips = len(statements)
+
+            # Re-assigning by id alone is a single UPDATE
+            statements.clear()
+            columns = ShiftColumns.from_query(Shift.query.order_by(Shift.start_time))
+            reassigned = DayNightBalancedScheduling().assign_columns(columns, list(reversed(staff)))
+            self.assertEqual(reassigned.apply(), 60)
+            db.session.commit()
+            apply_updates = [s for s in statements if s.startswith("UPDATE")]
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+
+        self.assertLessEqual(persist_trips, 4)  # group, schedules (INSERT ... RETURNING), shifts, notifications
+        self.assertEqual(len(apply_updates), 1)
+        self.assertEqual(len(schedules), 60)
+        self.assertEqual([len(s.shifts) for s in schedules], [1] * 60)
+        self.assertEqual([s.name for s in schedules], result.group_labels)
+
+        stored = dict(db.session.query(Shift.id, Shift.staff_id).all())
+        self.assertEqual(stored, reassigned.as_dict())
+        self.assertTrue(all(shift.schedule_id is not None for shift in Shift.query))
+
+    @pytest.mark.integration
+    def test_autopopulate_page_does_not_refresh_schedules_one_by_one(self):
+        from flask import current_app
+        from sqlalchemy import event
+        from flask_jwt_extended import create_access_token
+        admin = create_user("page_admin", "adminpass", "admin")
+        for i in range(3):
+            create_user(f"page_staff{i}", "pass", "staff")
+        base = datetime(2025, 6, 2)
+        db.session.add_all(Shift(start_time=base + timedelta(hours=8 * i), end_time=base + timedelta(hours=8 * i + 8))
+                           for i in range(30))
+        db.session.commit()
+        client = current_app.test_client()
+        client.set_cookie("access_token", create_access_token(identity=str(admin.id)))
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            response = client.post("/autopopulate", data={"strategy": "day/night"})
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(as_text=True).count("<option value="), Schedule.query.count() + 1)
+        # max id, the bulk read-back and the reload after commit, not one refresh per schedule
+        schedule_selects = [s for s in statements if s.startswith("SELECT") and "\nFROM schedule" in s]
+        self.assertGreater(Schedule.query.count(), 3)
+        self.assertLessEqual(len(schedule_selects), 3, schedule_selects)
+
+    @pytest.mark.integration
+    def test_autopopulate_rejects_an_infinite_time_budget(self):
+        from flask import current_app
+        from flask_jwt_extended import create_access_token
+        admin = create_user("budget_admin", "adminpass", "admin")
+        create_user("budget_staff", "pass", "staff")
+        db.session.add(Shift(start_time=datetime(2025, 6, 2, 8), end_time=datetime(2025, 6, 2, 16)))
+        db.session.commit()
+        client = current_app.test_client()
+        client.set_cookie("access_token", create_access_token(identity=str(admin.id)))
+
+        response = client.post("/autopopulate", data={"strategy": "optimized", "time_budget": "inf"})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.location.endswith("/autopopulate-options"))
+        self.assertEqual(Schedule.query.count(), 0)
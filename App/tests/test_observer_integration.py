@@ -187,5 +187,110 @@ class ObserverIntegrationTests(unittest.TestCase):
             self.assertGreater(len(notifications), 0,
                             "Removing schedule should trigger notification")
 
+    def test_bulk_roster_creation_notifies_each_staff_once(self):
+        from sqlalchemy import event
+        from App.models.GroupRosterFactory import GroupRosterFactory
+
+        with self.app.app_context():
+            staff = Staff.query.order_by(Staff.id).all()
+            base_time = datetime(2025, 5, 5, 8)
+            shifts = [Shift(start_time=base_time + timedelta(hours=8 * i),
+                            end_time=base_time + timedelta(hours=8 * i + 8)) for i in range(30)]
+            db.session.add_all(shifts)
+            db.session.commit()
+            Notification.query.delete()
+            db.session.commit()
+
+            inserts = []
+            listener = lambda conn, cursor, statement, *args: inserts.append(statement) \
+                if statement.startswith("INSERT INTO notification") else None
+            event.listen(db.engine, "before_cursor_execute", listener)
+            try:
+                # One schedule per shift, so 30 add_schedule calls in a single transaction
+                GroupRosterFactory().createRosterWithStrategy(
+                    "day_night_balanced", shifts, staff, group_name="Bulk", session=db.session, commit=True)
+            finally:
+                event.remove(db.engine, "before_cursor_execute", listener)
+
+            self.assertEqual(len(inserts), 1)
+            receivers = [n.receiver_id for n in Notification.query.all()]
+            self.assertEqual(sorted(receivers), sorted(s.id for s in staff))
+
+    def test_roster_builds_without_app_context(self):
+        import threading
+        from flask import has_app_context
+        from App.models.GroupRosterFactory import GroupRosterFactory
+        from App.models.Strategies.StrategyEvaluator import StaffRef
+
+        base_time = datetime(2025, 5, 5, 8)
+        shifts = []
+        for i in range(6):
+            shift = Shift(start_time=base_time + timedelta(hours=8 * i),
+                          end_time=base_time + timedelta(hours=8 * i + 8))
+            shift.id = i + 1
+            shifts.append(shift)
+        outcome = {}
+
+        def build():
+            # A fresh thread starts with no Flask context, like a script or the benchmarks
+            outcome["app_context"] = has_app_context()
+            try:
+                group = GroupRosterFactory().createRosterWithStrategy(
+                    "day_night_balanced", shifts, [StaffRef(1), StaffRef(2)], group_name="Offline")
+                outcome["schedules"] = len(group.schedules)
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=build)
+        thread.start()
+        thread.join()
+
+        self.assertFalse(outcome["app_context"])
+        self.assertNotIn("error", outcome)
+        self.assertGreater(outcome["schedules"], 0)
+
+
+    def test_notify_observers_writes_one_batch_and_commits_once(self):
+        from sqlalchemy import event
+        from App.controllers.notification import create_notification
+        from App.interfaces.Observer import Observer
+
+        class Auditor(Observer):
+            def __init__(self, user_id):
+                self.user_id = user_id
+
+            def update(self, observable):
+                return create_notification(self.user_id, f"Audit of {observable.name}")
+
+        with self.app.app_context():
+            schedule_group = ScheduleGroup(name="Batched Group")
+            db.session.add(schedule_group)
+            db.session.commit()
+            Notification.query.delete()
+            db.session.commit()
+
+            for staff in Staff.query.all():
+                schedule_group.attach(staff)
+            schedule_group.attach(Auditor(self.admin.id))
+
+            inserts, commits = [], []
+            count_inserts = lambda conn, cursor, statement, *args: inserts.append(statement) \
+                if statement.startswith("INSERT INTO notification") else None
+            count_commits = lambda session: commits.append(session)
+            event.listen(db.engine, "before_cursor_execute", count_inserts)
+            event.listen(db.session, "after_commit", count_commits)
+            try:
+                schedule_group.notifyObservers()
+            finally:
+                event.remove(db.engine, "before_cursor_execute", count_inserts)
+                event.remove(db.session, "after_commit", count_commits)
+
+            self.assertEqual(len(inserts), 1)
+            self.assertEqual(len(commits), 1)
+            messages = {(n.receiver_id, n.message) for n in Notification.query.all()}
+            self.assertEqual(len(messages), 4)
+            self.assertIn((self.admin.id, "Audit of Batched Group"), messages)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
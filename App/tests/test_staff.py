@@ -2,7 +2,7 @@ import unittest, pytest
 from datetime import datetime, timedelta
 from App.database import db, create_db
 from App.models import Schedule, Shift
-from App.controllers import create_user, schedule_shift, get_combined_roster, clock_in, clock_out, get_shift
+from App.controllers import create_user, schedule_shift, get_combined_roster, get_staff_roster, clock_in, clock_out, get_shift
 
 @pytest.fixture(autouse=True)
 def clean_db():
@@ -136,6 +136,40 @@ class StaffTests(unittest.TestCase):
         self.assertTrue(any(s["staff_id"] == staff1.id for s in roster))
         self.assertTrue(any(s["staff_id"] == staff2.id for s in roster))
         
+    @pytest.mark.integration
+    def test_staff_roster_window_and_keyset_pages(self):
+        admin = create_user("admin", "adminpass", "admin")
+        staff1 = create_user("jane", "janepass", "staff")
+        staff2 = create_user("mark", "markpass", "staff")
+        schedule = Schedule(name="Windowed Roster", created_by=admin.id)
+        db.session.add(schedule)
+        db.session.commit()
+
+        base = datetime(2025, 6, 2, 8)
+        for day in range(10):
+            schedule_shift(admin.id, staff1, schedule, base + timedelta(days=day), base + timedelta(days=day, hours=8))
+            schedule_shift(admin.id, staff2, schedule, base + timedelta(days=day), base + timedelta(days=day, hours=8))
+
+        window = dict(start=datetime(2025, 6, 3), end=datetime(2025, 6, 10))
+        seen, cursor = [], None
+        while True:
+            page = get_staff_roster(staff1.id, after=cursor, limit=3, **window)
+            seen.extend(page["shifts"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(len(seen), 7)
+        self.assertTrue(all(s["staff_id"] == staff1.id for s in seen))
+        self.assertEqual([s["start_time"] for s in seen], sorted(s["start_time"] for s in seen))
+        self.assertEqual(seen[0]["start_time"], "2025-06-03T08:00:00")
+        self.assertEqual(seen[-1]["start_time"], "2025-06-09T08:00:00")
+
+        with pytest.raises(ValueError):
+            get_staff_roster(staff1.id, after="not-a-cursor")
+        with pytest.raises(PermissionError):
+            get_staff_roster(admin.id)
+
     @pytest.mark.integration
     def test_staff_clock_in_and_out(self):
         admin = create_user("admin", "adminpass", "admin")
@@ -181,3 +181,321 @@ class StrategyUnitTests(unittest.TestCase):
                 self.assertIn("staff_id", shift_json)
                 self.assertIn("start_time", shift_json)
                 self.assertIn("end_time", shift_json)
+
+    # Heap-based day/night picks match a full min() scan, ties included
+    def test_day_night_heap_matches_linear_scan(self):
+        from collections import defaultdict
+        from App.models.Strategies.DayNightBalancedScheduling import assign_balanced
+
+        base = datetime(2025, 1, 1)
+        shifts = [Shift(start_time=base + timedelta(hours=5 * i), end_time=base + timedelta(hours=5 * i + 4))
+                  for i in range(60)]
+        staff = self.staff + [self._create_mock_staff(4, "Dana")]
+
+        day_count = defaultdict(int)
+        night_count = defaultdict(int)
+        expected = []
+        for shift in shifts:
+            member = min(staff, key=lambda s: abs(day_count[s.id] - night_count[s.id]))
+            if 6 <= shift.start_time.hour < 18:
+                day_count[member.id] += 1
+            else:
+                night_count[member.id] += 1
+            expected.append(member.id)
+
+        self.assertEqual([s.id for s in assign_balanced(shifts, staff)], expected)
+
+    # Heap-based day owners match a full min() scan over active day counts
+    def test_minimize_day_heap_matches_linear_scan(self):
+        from App.models.Strategies.MinimizeDaySchedulingStrategy import assign_days
+
+        staff = [self._create_mock_staff(5, "Eve")] + self.staff
+        active = {s.id: 0 for s in staff}
+        expected = []
+        for _ in range(20):
+            member = min(staff, key=lambda s: active[s.id])
+            active[member.id] += 1
+            expected.append(member.id)
+
+        self.assertEqual([s.id for s in assign_days(20, staff)], expected)
+
+    # assign() is a dry run: shifts are untouched until the result is materialized
+    def test_assign_is_dry_run_until_materialized(self):
+        strategy = MinimizeDaySchedulingStrategy()
+        result = strategy.assign(self.shifts, self.staff)
+
+        self.assertEqual(len(result), len(self.shifts))
+        self.assertTrue(all(shift.staff_id is None for shift in self.shifts))
+        self.assertEqual(len(result.group_labels), 3)
+
+        group = result.materialize()
+        self.assertEqual(group.name, "Minimal Day Schedule")
+        self.assertEqual(len(group.schedules), 3)
+        self.assertEqual([shift.staff_id for shift, _ in result], list(result.staff_ids))
+
+    # NumPy kernels and the pure-Python fallback produce identical results
+    def test_columnar_kernels_match_without_numpy(self):
+        import importlib, random
+        from unittest import mock
+        columns_module, even_module, minimize_module, day_night_module = [
+            importlib.import_module(f"App.models.Strategies.{name}")
+            for name in ("ShiftColumns", "EvenDistributionStrategy", "MinimizeDaySchedulingStrategy", "DayNightBalancedScheduling")
+        ]
+
+        rng = random.Random(7)
+        base = datetime(2024, 12, 30)
+        shifts = []
+        for i in range(200):
+            start = base + timedelta(days=rng.randrange(30), hours=rng.randrange(24), minutes=rng.choice([0, 30]))
+            shift = Shift(start_time=start, end_time=start + timedelta(hours=8))
+            shift.id = i + 1
+            shifts.append(shift)
+
+        def run(strategy):
+            result = strategy.assign(shifts, self.staff)
+            return list(result.staff_ids), list(result.group_index), result.group_labels
+
+        for strategy in [EvenDistributionStrategy(), MinimizeDaySchedulingStrategy(), DayNightBalancedScheduling()]:
+            with self.subTest(strategy=strategy.__class__.__name__):
+                expected = run(strategy)
+                with mock.patch.multiple(columns_module, numpy=None), \
+                        mock.patch.multiple(even_module, numpy=None), \
+                        mock.patch.multiple(minimize_module, numpy=None), \
+                        mock.patch.multiple(day_night_module, numpy=None):
+                    self.assertEqual(run(strategy), expected)
+
+    # Auto-select runs every strategy, in a pool or inline, and keeps the lowest score
+    def test_strategy_evaluator_picks_best(self):
+        from App.models.GroupRosterFactory import GroupRosterFactory
+        from App.models.Strategies import ScheduleObjective, StrategyEvaluator
+
+        for shift_id, shift in enumerate(self.mixed_shifts, start=1):
+            shift.id = shift_id
+
+        factory = GroupRosterFactory()
+        objective = ScheduleObjective({"day_night": 1.0})
+        inline = factory.evaluate_strategies(self.mixed_shifts, self.staff, objective, parallel=False)
+        pooled = StrategyEvaluator(factory._strategies, objective, max_workers=2, min_parallel_shifts=0) \
+            .evaluate(self.mixed_shifts, self.staff)
+
+        self.assertEqual(set(inline.scores), set(factory._strategies))
+        self.assertEqual(inline.scores[inline.name], min(inline.scores.values()))
+        best = min(inline.scores.values())
+        self.assertEqual(inline.name, next(name for name, score in inline.scores.items() if score == best))
+        self.assertEqual(pooled.scores, inline.scores)
+        self.assertEqual(pooled.result.as_dict(), inline.result.as_dict())
+        self.assertTrue(all(shift.staff_id is None for shift in self.mixed_shifts))
+
+    # Every evaluation in a process shares one pool instead of starting its own
+    def test_strategy_evaluator_reuses_one_pool(self):
+        from App.models.GroupRosterFactory import GroupRosterFactory
+        from App.models.Strategies import StrategyEvaluator
+        from App.models.Strategies.StrategyEvaluator import _shared_pool
+
+        for shift_id, shift in enumerate(self.mixed_shifts, start=1):
+            shift.id = shift_id
+
+        evaluator = StrategyEvaluator(GroupRosterFactory()._strategies, max_workers=2, min_parallel_shifts=0)
+        first = evaluator.evaluate(self.mixed_shifts, self.staff)
+        pool = _shared_pool()
+        second = evaluator.evaluate(self.mixed_shifts, self.staff)
+
+        self.assertIs(_shared_pool(), pool)
+        self.assertEqual(second.scores, first.scores)
+
+    # Repeated runs on the same input are served from the LRU result cache
+    def test_result_cache_hits_and_eviction(self):
+        from App.models.Strategies import ResultCache
+
+        cache = ResultCache(max_entries=1)
+        even, minimize = EvenDistributionStrategy(), MinimizeDaySchedulingStrategy()
+
+        first = cache.get_or_assign(even, self.shifts, self.staff)
+        second = cache.get_or_assign(even, self.shifts, self.staff)
+        self.assertEqual(list(second.staff_ids), list(first.staff_ids))
+        self.assertEqual(second.group_labels, first.group_labels)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        cache.get_or_assign(even, self.shifts, self.staff[:2])
+        cache.get_or_assign(minimize, self.shifts, self.staff)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 3, 1))
+        self.assertEqual(stats["evictions"], 2)
+
+        cache.clear()
+        self.assertEqual(cache.stats()["rows"], 0)
+
+    # Placing appended shifts incrementally matches re-running the whole strategy
+    def test_reschedule_matches_full_run(self):
+        from App.models.Strategies import SchedulingState
+
+        base = datetime(2025, 2, 1)
+        shifts = []
+        for i in range(40):
+            start = base + timedelta(hours=7 * i)
+            shift = Shift(start_time=start, end_time=start + timedelta(hours=6))
+            shift.id = i + 1
+            shifts.append(shift)
+        existing, added = shifts[:25], shifts[25:]
+
+        for strategy in [EvenDistributionStrategy(), MinimizeDaySchedulingStrategy(), DayNightBalancedScheduling()]:
+            with self.subTest(strategy=strategy.__class__.__name__):
+                full = strategy.assign(shifts, self.staff).as_dict()
+
+                previous = strategy.assign(existing, self.staff)
+                state = SchedulingState.from_assignments(
+                    self.staff, ((previous.as_dict()[s.id], s.start_time) for s in existing))
+                changes = strategy.reschedule(state, added=added)
+
+                self.assertEqual(len(changes), len(added))
+                self.assertEqual(changes.as_dict(), {s.id: full[s.id] for s in added})
+
+    # Removing a shift frees its slot for the next added one
+    def test_reschedule_after_removal(self):
+        from App.models.Strategies import SchedulingState
+
+        strategy = DayNightBalancedScheduling()
+        strategy.generateSchedule(self.mixed_shifts, self.staff)
+        state = SchedulingState.from_shifts(self.staff, self.mixed_shifts)
+        removed = self.mixed_shifts[0]
+        replacement = Shift(start_time=removed.start_time + timedelta(days=7), end_time=removed.end_time + timedelta(days=7))
+
+        changes = strategy.reschedule(state, added=[replacement], removed=[removed])
+        self.assertEqual(list(changes.staff_ids), [removed.staff_id])
+        self.assertEqual(sum(state.loads.values()), len(self.mixed_shifts))
+
+    # Local search only keeps improving moves, and its running sums match a full re-score
+    def test_local_search_improves_on_greedy_start(self):
+        from App.models.Strategies import LocalSearchStrategy, ScheduleObjective
+        from App.models.Strategies.ShiftColumns import ShiftColumns
+
+        base = datetime(2025, 3, 1)
+        shifts = []
+        for i in range(90):
+            start = base + timedelta(days=i // 6, hours=[2, 7, 9, 13, 19, 22][i % 6])
+            shifts.append(Shift(start_time=start, end_time=start + timedelta(hours=4)))
+        staff = self.staff + [self._create_mock_staff(4, "Dana"), self._create_mock_staff(5, "Eve")]
+
+        columns = ShiftColumns.from_shifts(shifts)
+        objective = ScheduleObjective()
+        staff_ids = [s.id for s in staff]
+
+        strategy = LocalSearchStrategy(time_budget=0.2)
+        greedy = strategy.initial.assign_columns(columns, staff)
+        optimized = strategy.assign_columns(columns, staff)
+
+        self.assertEqual(len(optimized), len(shifts))
+        self.assertLess(objective(optimized, columns, staff_ids), objective(greedy, columns, staff_ids))
+        self.assertNotEqual(strategy.cache_key(), strategy.with_budget(1.0).cache_key())
+        self.assertEqual(LocalSearchStrategy(time_budget=0).assign_columns(columns, staff).as_dict(), greedy.as_dict())
+
+        # Budgets come from a web form: infinity and NaN are refused, anything huge is capped
+        from App.models.Strategies.LocalSearchStrategy import MAX_TIME_BUDGET
+        self.assertEqual(strategy.with_budget(1e9).time_budget, MAX_TIME_BUDGET)
+        for budget in (float("inf"), float("nan"), -1):
+            with self.assertRaises(ValueError):
+                strategy.with_budget(budget)
+
+    # Min-cost flow covers every shift without double-booking anyone, within the load cap
+    def test_min_cost_flow_respects_overlaps_and_caps(self):
+        from App.models.Strategies import MinCostFlowStrategy, ScheduleObjective
+        from App.models.Strategies.ShiftColumns import ShiftColumns
+
+        # Three weeks of two concurrent 8-hour shifts plus a staggered one overlapping both
+        base = datetime(2025, 3, 3)
+        shifts = []
+        for day in range(21):
+            for hours, length in [(6, 8), (6, 8), (10, 8), (22, 8)]:
+                start = base + timedelta(days=day, hours=hours)
+                shifts.append(Shift(start_time=start, end_time=start + timedelta(hours=length)))
+        staff = self.staff + [self._create_mock_staff(4, "Dana"), self._create_mock_staff(5, "Eve")]
+        columns = ShiftColumns.from_shifts(shifts)
+        staff_ids = [s.id for s in staff]
+        greedy = DayNightBalancedScheduling().assign_columns(columns, staff)
+
+        for strategy in (MinCostFlowStrategy(max_shifts_per_staff=17), MinCostFlowStrategy(pool_slack=0),
+                         MinCostFlowStrategy(max_shifts_per_staff=17, time_budget=0), MinCostFlowStrategy(block_size=3)):
+            result = strategy.assign_columns(columns, staff)
+            self.assertEqual(len(result), len(shifts))
+
+            by_staff = {}
+            for shift, staff_id in result:
+                by_staff.setdefault(staff_id, []).append((shift.start_time, shift.end_time))
+            for intervals in by_staff.values():
+                intervals.sort()
+                for (_, end), (start, _) in zip(intervals, intervals[1:]):
+                    self.assertLessEqual(end, start)
+            self.assertLessEqual(max(len(intervals) for intervals in by_staff.values()), 17)
+
+            fairness = ScheduleObjective({"fairness": 1.0})
+            self.assertLessEqual(fairness(result, columns, staff_ids), fairness(greedy, columns, staff_ids))
+
+        with self.assertRaises(ValueError):
+            MinCostFlowStrategy(max_shifts_per_staff=16).assign_columns(columns, staff)
+        with self.assertRaises(ValueError):
+            MinCostFlowStrategy().assign_columns(columns, staff[:2])
+
+    # The time budget holds inside a week too, however many shifts it has
+    def test_min_cost_flow_time_budget_bounds_large_weeks(self):
+        import time
+        from App.models.Strategies import MinCostFlowStrategy
+        from App.models.Strategies.MinCostFlow import MinCostFlow
+        from App.models.Strategies.ShiftColumns import ShiftColumns
+        from benchmarks.workload import make_workload
+
+        graph = MinCostFlow(2)
+        graph.add_edge(0, 1, 1, 0)
+        self.assertEqual(graph.solve(0, 1, deadline=time.perf_counter() - 1), (0, 0))
+
+        workload = make_workload(1200, 7, 150)
+        columns = ShiftColumns.from_shifts(workload.shifts)
+        for strategy in (MinCostFlowStrategy(time_budget=0.2), MinCostFlowStrategy(time_budget=0.2, block_size=None)):
+            started = time.perf_counter()
+            result = strategy.assign_columns(columns, workload.staff)
+            self.assertLess(time.perf_counter() - started, 5)
+            self.assertEqual(len(result), len(workload.shifts))
+
+    # The overlap index answers clash checks from sorted per-staff intervals
+    def test_overlap_index_and_conflict_scan(self):
+        from App.models.Strategies import OverlapIndex, find_conflicts
+
+        index = OverlapIndex.from_rows([(1, 8, 16, "a"), (1, 16, 24, "b"), (2, 10, 12, "c")])
+        self.assertEqual(index.find(1, 15, 16), "a")
+        self.assertEqual(index.find(1, 20, 30), "b")
+        self.assertIsNone(index.find(1, 24, 30))
+        self.assertIsNone(index.find(2, 12, 20))
+        self.assertFalse(index.add(1, 0, 9, "d"))
+        self.assertTrue(index.add(1, 0, 8, "d"))
+
+        index.discard(1, 8, 16)
+        self.assertIsNone(index.find(1, 9, 10))
+        index.forget_before(16)
+        self.assertEqual(len(index), 1)
+
+        rows = [(1, 0, 10, "a"), (1, 2, 4, "b"), (1, 5, 12, "c"), (1, 12, 14, "d"), (2, 0, 10, "e"), (None, 0, 10, "f")]
+        self.assertEqual([tuple(c) for c in find_conflicts(rows)], [(1, "a", "b"), (1, "a", "c")])
+
+    # No strategy hands one person two overlapping shifts when someone else is free
+    def test_strategies_avoid_overlapping_shifts(self):
+        from App.models.Strategies import LocalSearchStrategy, MinCostFlowStrategy, SchedulingState
+
+        # 16:00-24:00 and 22:00-06:00 overlap, so the minimal-day owner can't take both
+        for strategy in [EvenDistributionStrategy(), MinimizeDaySchedulingStrategy(), DayNightBalancedScheduling(),
+                         LocalSearchStrategy(time_budget=0.05), MinCostFlowStrategy()]:
+            with self.subTest(strategy=strategy.__class__.__name__):
+                result = strategy.assign(self.shifts, self.staff)
+                by_staff = {}
+                for shift, staff_id in result:
+                    by_staff.setdefault(staff_id, []).append((shift.start_time, shift.end_time))
+                for intervals in by_staff.values():
+                    intervals.sort()
+                    for (_, end), (start, _) in zip(intervals, intervals[1:]):
+                        self.assertLessEqual(end, start)
+
+        state = SchedulingState(self.staff)
+        busy = Shift(start_time=datetime(2025, 1, 15, 8), end_time=datetime(2025, 1, 15, 16))
+        busy.staff_id = 1
+        overlapping = Shift(start_time=datetime(2025, 1, 15, 12), end_time=datetime(2025, 1, 15, 20))
+        state.add(1, busy.start_time, busy.end_time)
+        changes = MinimizeDaySchedulingStrategy().reschedule(state, added=[overlapping])
+        self.assertNotEqual(list(changes.staff_ids), [1])
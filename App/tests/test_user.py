@@ -2,7 +2,7 @@ import unittest, pytest
 from datetime import datetime
 from App.database import db, create_db
 from App.models import User
-from App.controllers import create_user, get_user, update_user, get_all_users_json, loginCLI
+from App.controllers import create_user, get_user, update_user, get_all_users_json, loginCLI, current_identity
 
 @pytest.fixture(autouse=True)
 def clean_db():
@@ -109,4 +109,75 @@ class UserTests(unittest.TestCase):
             {"id": 1, "username": "bot", "role": "admin"},
             {"id": 2, "username": "pam", "role": "staff"},
         ]
-        self.assertEqual(users_json, expected)
\ No newline at end of file
+        self.assertEqual(users_json, expected)
+
+    @pytest.mark.unit
+    def test_template_identity_is_resolved_only_when_used(self):
+        from flask import current_app, request, render_template_string
+        from flask_jwt_extended import create_access_token
+        user = create_user("lazy", "lazypass", "staff")
+        token = create_access_token(identity=str(user.id))
+
+        with current_app.test_request_context(headers={"Authorization": f"Bearer {token}"}):
+            self.assertEqual(render_template_string("plain page"), "plain page")
+            self.assertNotIn("roster.identity", request.environ)
+            self.assertEqual(render_template_string("{% if is_authenticated %}{{ current_user.username }}{% endif %}"), "lazy")
+            self.assertEqual(request.environ["roster.identity"]["current"].role, "staff")
+
+        with current_app.test_request_context(headers={"Authorization": "Bearer not-a-token"}):
+            self.assertEqual(render_template_string("{{ is_authenticated }}"), "False")
+
+    @pytest.mark.int
+    def test_identity_does_not_leak_into_the_next_request(self):
+        from flask import current_app
+        from flask_jwt_extended import create_access_token
+        admin = create_user("leak_admin", "adminpass", "admin")
+        token = create_access_token(identity=str(admin.id))
+
+        signed_in = current_app.test_client().get("/viewSchedule", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(signed_in.status_code, 200)
+        self.assertIn("Logout", signed_in.get_data(as_text=True))
+
+        # A new client with no token, served by the same long-lived app context
+        anonymous = current_app.test_client().get("/viewSchedule")
+        self.assertEqual(anonymous.status_code, 401)
+        self.assertNotIn("Logout", anonymous.get_data(as_text=True))
+        with current_app.test_request_context():
+            self.assertIsNone(current_identity())
+
+    @pytest.mark.int
+    def test_login_rehashes_outdated_password_off_thread(self):
+        import threading
+        from unittest.mock import patch
+        from flask import current_app
+        from werkzeug.security import check_password_hash
+        from App.passwords import PasswordHasher
+        original = current_app.extensions["password_hasher"]
+        try:
+            current_app.extensions["password_hasher"] = PasswordHasher("pbkdf2:sha256:1000", workers=0)
+            create_user("old", "oldpass", "staff")
+
+            hasher = PasswordHasher("pbkdf2:sha256:2000", salt_length=20, workers=2)
+            current_app.extensions["password_hasher"] = hasher
+            threads = []
+
+            def check(pwhash, password):
+                threads.append(threading.current_thread())
+                return check_password_hash(pwhash, password)
+
+            with patch("App.passwords.check_password_hash", check):
+                self.assertIsNone(loginCLI("old", "wrongpass").get("token"))
+                self.assertTrue(User.query.filter_by(username="old").one().password.startswith("pbkdf2:sha256:1000$"))
+                self.assertIsNotNone(loginCLI("old", "oldpass")["token"])
+            self.assertEqual(len(threads), 2)
+            self.assertNotIn(threading.current_thread(), threads)
+            user = User.query.filter_by(username="old").one()
+            self.assertTrue(user.password.startswith("pbkdf2:sha256:2000$"))
+            self.assertFalse(user.password_needs_rehash())
+            self.assertTrue(user.check_password("oldpass"))
+            hasher.shutdown()
+        finally:
+            current_app.extensions["password_hasher"] = original
+
+        with self.assertRaises(ValueError):
+            PasswordHasher("md5")
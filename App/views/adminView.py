@@ -1,13 +1,16 @@
-from flask import Blueprint, jsonify, request, render_template, flash, redirect, url_for
+from flask import Blueprint, Response, jsonify, request, render_template, flash, redirect, url_for, stream_with_context
+import math
 from datetime import datetime
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy.exc import SQLAlchemyError
 
 from App.controllers import admin as adminController
 from App.controllers.user import get_user
+from App.controllers.identity import current_identity, role_required
 from App.models import Schedule, User, Staff, Shift
 from App.database import db
-from App.models.Strategies import EvenDistributionStrategy, MinimizeDaySchedulingStrategy, DayNightBalancedScheduling
+from App.models.Strategies import EvenDistributionStrategy, MinimizeDaySchedulingStrategy, DayNightBalancedScheduling, result_cache
+from App.models.GroupRosterFactory import GroupRosterFactory
 from App.controllers.schedule_processor import autopopulate
 
 
@@ -18,8 +21,7 @@ admin_view = Blueprint('admin_view', __name__)
 @admin_view.route('/admin', methods=['GET'])
 @jwt_required()
 def get_admin_page():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
     return redirect(url_for('user_views.get_user_page'))
     #return render_template("users.html", user=user)
 
@@ -27,8 +29,7 @@ def get_admin_page():
 @admin_view.route('/createNewSchedule', methods=['GET'])
 @jwt_required()
 def get_schedule_page():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
     schedules = Schedule.query.all()
     return render_template("schedule.html", user=user, schedules=schedules)
 
@@ -36,19 +37,22 @@ def get_schedule_page():
 @admin_view.route('/createNewUser', methods=['GET'])
 @jwt_required()
 def get_newuser_page():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
     return render_template("newUser.html", user=user)
 
 #Route to view Schedule
 @admin_view.route('/viewSchedule', methods=['GET'])
 @jwt_required()
 def view_schedule_page():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
+    # Counts come with the schedules, only the selected schedule's shifts (and their staff) are loaded
     schedules = Schedule.query.all()
     selected_schedule_id = request.args.get('schedule_id', type=int)
-    return render_template("scheduleView.html", user=user, schedules=schedules, selected_schedule_id=selected_schedule_id)
+    selected_schedule = None
+    if selected_schedule_id:
+        selected_schedule = Schedule.query.options(Schedule.json_loader()).filter_by(id=selected_schedule_id).first()
+    return render_template("scheduleView.html", user=user, schedules=schedules,
+                           selected_schedule_id=selected_schedule_id, selected_schedule=selected_schedule)
 
 @admin_view.route('/createSchedule', methods=['POST'])
 @jwt_required()
@@ -80,8 +84,7 @@ def createSchedule():
 @admin_view.route('/scheduleShift', methods=['GET'])
 @jwt_required()
 def scheduleShift():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
     users = User.query.all()
     schedules = Schedule.query.all()
     return render_template("shift.html", user=user, users=users, schedules=schedules)
@@ -131,11 +134,11 @@ def createShift():
 
 
 @admin_view.route('/shiftReport', methods=['GET'])
-@jwt_required()
+@role_required("admin")
 def shiftReport():
     try:
         admin_id = get_jwt_identity()
-        user = User.query.get(admin_id)
+        user = current_identity()
         report = adminController.get_shift_report(admin_id)
         
         try:
@@ -148,18 +151,40 @@ def shiftReport():
     except SQLAlchemyError:
         return jsonify({"error": "Database error"}), 500
     
+# Streams the report instead of building it in memory, ?format=ndjson (default) or csv
+@admin_view.route('/shiftReport/export', methods=['GET'])
+@role_required("admin")
+def export_shift_report():
+    fmt = request.args.get('format', 'ndjson').lower()
+    try:
+        chunks = adminController.stream_shift_report(get_jwt_identity(), fmt)
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename=shift_report.{fmt}"
+    return response
+
+
+# Counters of this worker's strategy result cache; each worker process keeps its own
+@admin_view.route('/admin/cache-stats', methods=['GET'])
+@role_required("admin")
+def cache_stats():
+    return jsonify(result_cache.stats()), 200
+
 @admin_view.route('/autopopulate-options', methods=['GET'])
 @jwt_required()
 def autopopulate_options():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
     return render_template("autopopulateOptions.html", user=user)
     
 @admin_view.route('/autopopulate', methods=['POST'])
 @jwt_required(locations=["cookies"])
 def autopopulate():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
     
     staff = Staff.query.all()
     shifts = Shift.query.order_by(Shift.start_time).all()
@@ -175,18 +200,24 @@ def autopopulate():
             strategy = MinimizeDaySchedulingStrategy()
         elif strategy_chosen=="day/night":
             strategy = DayNightBalancedScheduling()
+        elif strategy_chosen=="optimized":
+            time_budget = request.form.get("time_budget", type=float)
+            if time_budget is not None and not math.isfinite(time_budget):
+                flash("Time budget must be a number of seconds")
+                return redirect(url_for('admin_view.autopopulate_options'))
+            strategy = GroupRosterFactory().get_strategy("local_search", time_budget if time_budget and time_budget > 0 else None)
         else:
-            strategy = EvenDistributionStrategy() #brute force fallback if none selected or auto-select, however we wanna implement it
-        
-        generated = strategy.generateSchedule(shifts, staff)
-        schedules = generated.schedules if hasattr(generated, 'schedules') else [generated]
+            strategy = None
         
-        for schedule in schedules:
-            if hasattr(schedule, 'shifts'):
-                for shift in schedule.shifts:
-                    temp = Shift.query.get(shift.id)
-                    if temp:
-                        temp.staff_id = shift.staff_id #actual assignment of shift to staff                
-        db.session.add(generated)
+        if strategy_chosen=="auto": #runs every strategy side by side and keeps the best scoring roster
+            result = GroupRosterFactory().evaluate_strategies(shifts, staff).result
+        else:
+            strategy = strategy or EvenDistributionStrategy() #fallback if none selected
+            result = result_cache.get_or_assign(strategy, shifts, staff)
+
+        # One INSERT for the schedules and one executemany UPDATE for every shift's staff/schedule
+        schedule_ids = [schedule.id for schedule in result.persist(created_by=user.id)]
         db.session.commit()
+        # The commit expired them, read them back (shift counts included) in one SELECT
+        schedules = Schedule.query.filter(Schedule.id.in_(schedule_ids)).order_by(Schedule.id).all()
     return render_template("scheduleView.html", schedules = schedules, staff = staff, user=user)
\ No newline at end of file
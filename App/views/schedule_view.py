@@ -4,6 +4,7 @@ from App.controllers.schedule_processor import *
 from App.database import db
 from App.models import *
 from App.models.Strategies import *
+from App.models.Strategies.ShiftColumns import ShiftColumns
 
 schedule_views = Blueprint('schedule_views', __name__)
 
@@ -33,10 +34,10 @@ def populate_schedule(schedule_id, strategy):
         if not schedule:
             return jsonify({'error': 'Schedule not found'}), 404
         
-        # Get all shifts for the given schedule
-        shifts = Shift.query.filter_by(scheduleID=schedule_id).all()
+        # Only (id, start_time, end_time) of the schedule's shifts is read, no Shift objects are loaded
+        shifts = ShiftColumns.from_query(Shift.query.filter_by(schedule_id=schedule_id).order_by(Shift.start_time))
         
-        if not shifts:
+        if not len(shifts):
             return jsonify({'error': 'No shifts found for this schedule'}), 404
         
         # Get all available staff
@@ -57,14 +58,10 @@ def populate_schedule(schedule_id, strategy):
             return jsonify({'error': f'Invalid strategy: {strategy}'}), 400
         
         # Autopopulate using strategy
-        populated_schedule = autopopulate(strategy_instance, shifts, staff)
-        
-        # Save the populated schedule assignments to database
-        for shift in populated_schedule:
-            db_shift = db.session.get(Shift, shift.shiftID)
-            if db_shift:
-                db_shift.staffID = shift.staffID
+        populated_schedule = strategy_instance().assign_columns(shifts, staff)
         
+        # Save every assignment with one executemany UPDATE
+        populated_schedule.apply()
         db.session.commit()
         
         return jsonify({
@@ -73,6 +70,6 @@ def populate_schedule(schedule_id, strategy):
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': {str(e)}}), 500
+        return jsonify({'error': str(e)}), 500
 
         
\ No newline at end of file
@@ -1,10 +1,12 @@
 # app/views/staff_views.py
 from flask import Blueprint, jsonify, request, render_template, redirect, url_for, flash
 from App.controllers import staff
+from App.controllers.identity import current_identity, role_required
 from App.controllers.notification import get_user_notifications, mark_as_read
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy.exc import SQLAlchemyError
-from App.models import Schedule, Shift, User
+from datetime import datetime
+from App.models import Schedule, Shift
 
 staff_views = Blueprint('staff_views', __name__, template_folder='../templates')
 
@@ -20,19 +22,22 @@ staff_views = Blueprint('staff_views', __name__, template_folder='../templates')
 @staff_views.route('/staff', methods=['GET'])
 @jwt_required()
 def get_staff_page():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
     return render_template("staff.html", user=user)
 
 #Route to view Schedule
 @staff_views.route('/viewSchedule', methods=['GET'])
 @jwt_required()
 def view_schedule_page():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
+    # Counts come with the schedules, only the selected schedule's shifts (and their staff) are loaded
     schedules = Schedule.query.all()
     selected_schedule_id = request.args.get('schedule_id', type=int)
-    return render_template("scheduleView.html", user=user, schedules=schedules, selected_schedule_id=selected_schedule_id)
+    selected_schedule = None
+    if selected_schedule_id:
+        selected_schedule = Schedule.query.options(Schedule.json_loader()).filter_by(id=selected_schedule_id).first()
+    return render_template("scheduleView.html", user=user, schedules=schedules,
+                           selected_schedule_id=selected_schedule_id, selected_schedule=selected_schedule)
 
 
 # Staff view roster route
@@ -47,6 +52,29 @@ def view_roster():
     except SQLAlchemyError:
         return jsonify({"error": "Database error"}), 500
 
+# Staff's own shifts in a [from, to) window, paged with ?after=<next_cursor>
+@staff_views.route('/staff/roster/mine', methods=['GET'])
+@role_required("staff")
+def view_my_roster():
+    try:
+        staff_id = int(get_jwt_identity())
+        start = request.args.get('from')
+        end = request.args.get('to')
+        roster = staff.get_staff_roster(
+            staff_id,
+            start=datetime.fromisoformat(start) if start else None,
+            end=datetime.fromisoformat(end) if end else None,
+            after=request.args.get('after'),
+            limit=request.args.get('limit', staff.ROSTER_PAGE_SIZE, type=int),
+        )
+        return jsonify(roster), 200
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError:
+        return jsonify({"error": "Database error"}), 500
+
 @staff_views.route('/staff/shift', methods=['GET'])
 @jwt_required()
 def view_shift():
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, jsonify, request, send_from_directory, flash, redirect, url_for
-from flask_jwt_extended import jwt_required, current_user as jwt_current_user, get_jwt_identity
+from flask_jwt_extended import jwt_required
 
 from.index import index_views
 
@@ -7,17 +7,15 @@ from App.controllers import (
     create_user,
     get_all_users,
     get_all_users_json,
-    jwt_required
 )
-from App.models import User
+from App.controllers.identity import current_identity
 
 user_views = Blueprint('user_views', __name__, template_folder='../templates')
 
 @user_views.route('/users', methods=['GET'])
 @jwt_required()
 def get_user_page():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
     users = get_all_users()
     return render_template('users.html', user=user, users=users)
 
@@ -0,0 +1,69 @@
+"""Compare the heap-based DayNightBalancedScheduling assignment against the old
+min() scan over the whole staff list.
+
+    python -m benchmarks.bench_day_night --staff 500 --shifts 1000 10000 100000
+"""
+import argparse
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from App.models.Strategies.DayNightBalancedScheduling import assign_balanced
+
+
+def legacy_assign(shifts, staff):
+    day_count = defaultdict(int)
+    night_count = defaultdict(int)
+    picks = []
+    for shift in shifts:
+        is_day_shift = 6 <= shift.start_time.hour < 18
+        member = min(staff, key=lambda s: abs(day_count[s.id] - night_count[s.id]))
+        if is_day_shift:
+            day_count[member.id] += 1
+        else:
+            night_count[member.id] += 1
+        picks.append(member)
+    return picks
+
+
+def make_workload(shift_count, staff_count):
+    staff = [SimpleNamespace(id=i + 1) for i in range(staff_count)]
+    base = datetime(2025, 1, 1)
+    shifts = [
+        SimpleNamespace(start_time=base + timedelta(hours=8 * i))
+        for i in range(shift_count)
+    ]
+    return shifts, staff
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--staff", type=int, default=500)
+    parser.add_argument("--shifts", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--skip-legacy-above", type=int, default=100000,
+                        help="don't run the O(shifts x staff) scan past this many shifts")
+    args = parser.parse_args()
+
+    print(f"{'shifts':>8} {'legacy (s)':>12} {'heap (s)':>10} {'speedup':>9}")
+    for shift_count in args.shifts:
+        shifts, staff = make_workload(shift_count, args.staff)
+        heap_time, heap_picks = timed(assign_balanced, shifts, staff)
+
+        if shift_count > args.skip_legacy_above:
+            print(f"{shift_count:>8} {'skipped':>12} {heap_time:>10.4f} {'-':>9}")
+            continue
+
+        legacy_time, legacy_picks = timed(legacy_assign, shifts, staff)
+        assert [s.id for s in heap_picks] == [s.id for s in legacy_picks], "assignments differ"
+        print(f"{shift_count:>8} {legacy_time:>12.4f} {heap_time:>10.4f} {legacy_time / heap_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
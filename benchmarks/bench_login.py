@@ -0,0 +1,131 @@
+"""Login throughput with password checks inline against the hashing pool.
+
+Seeds users, then has --clients concurrent clients log in --logins times in
+total, once with PASSWORD_HASH_WORKERS=0 (hashing on the caller) and once
+per --workers value. Reports logins per second, p50/p99 login latency and
+the longest stall seen by a heartbeat that wakes every millisecond, which
+is how long the event loop was blocked when running under gevent.
+
+    python -m benchmarks.bench_login --clients 32 --logins 256 --workers 2 4 8
+    python -m benchmarks.bench_login --gevent --method pbkdf2:sha256:600000
+
+Needs a file database: with in-memory SQLite every thread would get its own
+empty database.
+"""
+import sys
+
+if "--gevent" in sys.argv:
+    # Before anything imports threading, as the gevent gunicorn worker does
+    from gevent import monkey
+    monkey.patch_all()
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from App.controllers.auth import login
+from App.database import db, create_db
+from App.main import create_app
+from App.models import Staff
+from App.passwords import PasswordHasher
+
+
+class Heartbeat:
+    """Sleeps 1ms at a time and records how late each wake-up was."""
+
+    def __init__(self) -> None:
+        self.max_stall = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def _beat(self) -> None:
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            time.sleep(0.001)
+            self.max_stall = max(self.max_stall, time.perf_counter() - started - 0.001)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def seed(users):
+    db.drop_all()
+    create_db()
+    db.session.add_all(Staff(username=f"bench{i}", password=f"pass{i}") for i in range(users))
+    db.session.commit()
+    db.session.remove()
+
+
+def run_clients(app, clients, logins, users):
+    latencies = []
+    lock = threading.Lock()
+    per_client = logins // clients
+
+    def client(n):
+        with app.app_context():
+            for i in range(per_client):
+                user = (n * per_client + i) % users
+                started = time.perf_counter()
+                assert login(f"bench{user}", f"pass{user}")
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+            db.session.remove()
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    with Heartbeat() as heartbeat:
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+    return wall, sorted(latencies), heartbeat.max_stall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=128)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--method", default="scrypt", help="PASSWORD_HASH_METHOD to benchmark")
+    parser.add_argument("--gevent", action="store_true", help="monkey patch with gevent first")
+    parser.add_argument("--database", help="SQLAlchemy URL of a scratch database (default: a temporary SQLite file)")
+    args = parser.parse_args()
+
+    scratch = None
+    if not args.database:
+        fd, scratch = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        args.database = f"sqlite:///{scratch}"
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": args.database, "PASSWORD_HASH_METHOD": args.method})
+    try:
+        with app.app_context():
+            seed(args.users)
+        print(f"{'workers':>8} {'logins/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max stall (ms)':>15}")
+        for workers in [0, *args.workers]:
+            hasher = PasswordHasher(args.method, workers=workers)
+            app.extensions["password_hasher"] = hasher
+            wall, latencies, stall = run_clients(app, args.clients, args.logins, args.users)
+            hasher.shutdown()
+            p50 = statistics.median(latencies)
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            label = workers or "inline"
+            print(f"{label:>8} {len(latencies) / wall:>9.1f} {p50 * 1000:>9.1f} {p99 * 1000:>9.1f} {stall * 1000:>15.1f}")
+    finally:
+        if scratch:
+            os.remove(scratch)
+
+
+if __name__ == "__main__":
+    main()
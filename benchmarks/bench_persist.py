@@ -0,0 +1,96 @@
+"""Compare saving an autopopulate result shift by shift against the bulk path.
+
+The legacy path fetches each Shift with session.get() and sets its staff_id,
+which costs a SELECT per shift plus the UPDATEs at flush. The bulk path is
+AssignmentResult.persist(): one INSERT for the schedules and one executemany
+UPDATE for the shifts. Statements are counted at the cursor, so an executemany
+counts as one round trip.
+
+    python -m benchmarks.bench_persist --shifts 100 1000 10000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from App.database import db, create_db
+from App.main import create_app
+from App.models import Shift, Staff
+from App.models.Strategies import DayNightBalancedScheduling
+from App.models.Strategies.ShiftColumns import ShiftColumns
+
+
+class StatementCounter:
+    def __init__(self, engine) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+
+
+def seed(shift_count, staff_count):
+    db.drop_all()
+    create_db()
+    db.session.add_all(Staff(username=f"bench{i}", password="pass") for i in range(staff_count))
+    base = datetime(2025, 1, 1)
+    db.session.add_all(
+        Shift(start_time=base + timedelta(hours=8 * i), end_time=base + timedelta(hours=8 * i + 8))
+        for i in range(shift_count)
+    )
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def assign(staff):
+    columns = ShiftColumns.from_query(Shift.query.order_by(Shift.start_time))
+    return DayNightBalancedScheduling().assign_columns(columns, staff)
+
+
+def legacy_apply(result):
+    for shift_id, staff_id in zip(result.shift_ids(), result.staff_ids):
+        shift = db.session.get(Shift, shift_id)
+        if shift:
+            shift.staff_id = staff_id
+    db.session.commit()
+
+
+def bulk_apply(result):
+    result.persist()
+    db.session.commit()
+
+
+def measure(counter, fn, result):
+    db.session.expunge_all()
+    before = counter.count
+    started = time.perf_counter()
+    fn(result)
+    return time.perf_counter() - started, counter.count - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--staff", type=int, default=50)
+    parser.add_argument("--shifts", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--database", default="sqlite://", help="SQLAlchemy URL of a scratch database")
+    args = parser.parse_args()
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": args.database})
+    with app.app_context():
+        counter = StatementCounter(db.engine)
+        print(f"{'shifts':>8} {'legacy trips':>13} {'legacy (s)':>11} {'bulk trips':>11} {'bulk (s)':>9}")
+        for shift_count in args.shifts:
+            seed(shift_count, args.staff)
+            staff = Staff.query.all()
+            legacy_time, legacy_trips = measure(counter, legacy_apply, assign(staff))
+
+            seed(shift_count, args.staff)
+            staff = Staff.query.all()
+            bulk_time, bulk_trips = measure(counter, bulk_apply, assign(staff))
+
+            print(f"{shift_count:>8} {legacy_trips:>13} {legacy_time:>11.4f} {bulk_trips:>11} {bulk_time:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Scheduling benchmark suite.
+
+Times every strategy in GroupRosterFactory, plus createRosterWithStrategy, on
+seeded synthetic workloads at several scales. It records the median wall time
+and peak traced memory, and writes the results as JSON. When given a
+baseline, it reports any case that got slower (or used more memory) than the
+tolerance allows and exits non-zero.
+
+    python -m benchmarks.suite --scales small medium --output bench.json
+    python -m benchmarks.suite --baseline bench.json --tolerance 0.25
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from App.models.GroupRosterFactory import GroupRosterFactory
+from App.models.Strategies.ResultCache import result_cache
+from App.models.Strategies.ShiftColumns import numpy
+from benchmarks.workload import make_workload
+
+
+# name: (staff, days, shifts per day)
+SCALES = {
+    "small": (20, 30, 3),
+    "medium": (200, 365, 6),
+    "large": (1000, 5 * 365, 12),
+}
+
+
+def _cases(factory):
+    for name, strategy in factory._strategies.items():
+        yield f"{name}.assign", lambda w, s=strategy: s.assign(w.shifts, w.staff)
+    for name in factory._strategies:
+        yield f"{name}.createRosterWithStrategy", \
+            lambda w, n=name: factory.createRosterWithStrategy(n, w.shifts, w.staff, group_name="bench")
+
+
+def _measure(fn, workload, repeats):
+    timings = []
+    for _ in range(repeats):
+        result_cache.clear()
+        gc.collect()
+        started = time.perf_counter()
+        fn(workload)
+        timings.append(time.perf_counter() - started)
+
+    result_cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    fn(workload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": statistics.median(timings), "peak_kib": peak / 1024}
+
+
+def run(scales, repeats, seed):
+    factory = GroupRosterFactory()
+    results = {}
+    for scale in scales:
+        staff_count, days, per_day = SCALES[scale]
+        workload = make_workload(staff_count, days, per_day, seed=seed)
+        for case, fn in _cases(factory):
+            key = f"{scale}/{case}"
+            results[key] = dict(_measure(fn, workload, repeats), shifts=len(workload.shifts), staff=staff_count)
+            print(f"{key:<60} {results[key]['seconds']:>9.4f}s {results[key]['peak_kib']:>12.0f} KiB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": getattr(numpy, "__version__", None),
+            "seed": seed,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Return a line per case that regressed by more than ``tolerance`` (0.2 = 20%)."""
+    regressions = []
+    for key, before in baseline["results"].items():
+        after = current["results"].get(key)
+        if after is None:
+            continue
+        for metric in ("seconds", "peak_kib"):
+            if before[metric] and after[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f"{key} {metric}: {before[metric]:.4f} -> {after[metric]:.4f} "
+                                   f"(+{after[metric] / before[metric] - 1:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    current = run(args.scales, args.repeats, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
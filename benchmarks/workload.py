@@ -0,0 +1,37 @@
+"""Seeded synthetic scheduling workloads for the benchmarks."""
+import random
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from App.models import Shift
+from App.models.Strategies.StrategyEvaluator import StaffRef
+
+
+Workload = namedtuple("Workload", "shifts staff")
+
+DAY_HOURS = list(range(6, 18))
+NIGHT_HOURS = list(range(18, 24)) + list(range(0, 6))
+
+
+def make_workload(staff_count, days, shifts_per_day, night_ratio=0.33, seed=0,
+                  start=datetime(2025, 1, 1), shift_hours=8):
+    """Build shifts and staff for a horizon of ``days`` days.
+
+    Staff are lightweight stand-ins (strategies only read ``.id``), shifts are
+    transient Shift objects with ids so results can be materialized.
+    """
+    rng = random.Random(seed)
+    staff = [StaffRef(staff_id) for staff_id in range(1, staff_count + 1)]
+
+    shifts = []
+    for day in range(days):
+        midnight = start + timedelta(days=day)
+        for _ in range(shifts_per_day):
+            hour = rng.choice(NIGHT_HOURS if rng.random() < night_ratio else DAY_HOURS)
+            shift_start = midnight + timedelta(hours=hour)
+            shift = Shift(start_time=shift_start, end_time=shift_start + timedelta(hours=shift_hours))
+            shift.id = len(shifts) + 1
+            shifts.append(shift)
+
+    rng.shuffle(shifts)
+    return Workload(shifts, staff)
@@ -4,12 +4,12 @@ from datetime import datetime, timedelta
 from flask_jwt_extended import decode_token, verify_jwt_in_request, get_jwt_identity
 
 from App.database import db, get_migrate
-from App.models import User, Schedule
+from App.models import User, Schedule, ScheduleGroup
 from App.main import create_app 
 from App.controllers import (
     create_user, get_all_users_json, get_user, get_all_users, initialize,
-    schedule_shift, get_combined_roster, clock_in, clock_out, get_shift_report,
-    login, loginCLI
+    schedule_shift, get_combined_roster, get_staff_roster, clock_in, clock_out, get_shift_report, stream_shift_report,
+    login, loginCLI, explain_hot_queries
 )
 
 #App and Database initialization
@@ -17,6 +17,24 @@ app = create_app()
 migrate = get_migrate(app)
 
 
+# Top level rather than under `flask db`, Flask-Migrate's group is resolved before this file is loaded
+@app.cli.command("explain-hot", help="EXPLAIN every hot query and fail if one scans a table or sorts without an index")
+@click.option("--verbose", is_flag=True, help="Print the SQL and the full plan of every query")
+def explain_hot_command(verbose):
+    failed = 0
+    for plan in explain_hot_queries():
+        status = "SCAN" if plan.problems else "ok"
+        print(f"[{status:>4}] {plan.name}")
+        if verbose:
+            print(f"       {plan.sql}")
+        for line in (plan.plan if verbose else plan.problems):
+            print(f"       {line}")
+        failed += bool(plan.problems)
+    if failed:
+        print(f"{failed} hot queries are not served by an index")
+        sys.exit(1)
+
+
 
 #Initialize Database
 @app.cli.command("init", help="Creates and initializes the database")
@@ -153,6 +171,27 @@ def roster_command():
     print(roster)
 
 
+
+@shift_cli.command("myroster", help="Staff views their own shifts in a date window, one page at a time")
+@click.option("--from", "start", default=None, help="Window start (ISO date/time, inclusive)")
+@click.option("--to", "end", default=None, help="Window end (ISO date/time, exclusive)")
+@click.option("--after", default=None, help="Cursor printed at the end of the previous page")
+@click.option("--limit", default=50, type=int, show_default=True)
+def my_roster_command(start, end, after, limit):
+    staff = require_staff_login()
+    page = get_staff_roster(
+        staff.id,
+        start=datetime.fromisoformat(start) if start else None,
+        end=datetime.fromisoformat(end) if end else None,
+        after=after,
+        limit=limit,
+    )
+    print(f"📋 Shifts for {staff.username}:")
+    for shift in page["shifts"]:
+        print(shift)
+    if page["next_cursor"]:
+        print(f"More shifts: --after {page['next_cursor']}")
+
 @shift_cli.command("clockin", help="Staff clocks in")
 @click.argument("shift_id", type=int)
 def clockin_command(shift_id):
@@ -172,11 +211,18 @@ def clockout_command(shift_id):
 
 
 @shift_cli.command("report", help="Admin views shift report")
-def report_command():
+@click.option("--format", "fmt", type=click.Choice(["text", "ndjson", "csv"]), default="text", show_default=True,
+              help="ndjson and csv are streamed row by row, use them for large reports")
+@click.option("--output", type=click.File("w"), default="-", help="File to write the report to (default: stdout)")
+def report_command(fmt, output):
     admin = require_admin_login()
-    report = get_shift_report(admin.id)
-    print(f"📊 Shift report for {admin.username}:")
-    print(report)
+    if fmt == "text":
+        report = get_shift_report(admin.id)
+        click.echo(f"📊 Shift report for {admin.username}:", file=output)
+        click.echo(report, file=output)
+        return
+    for chunk in stream_shift_report(admin.id, fmt):
+        output.write(chunk)
 
 app.cli.add_command(shift_cli)
 
@@ -204,7 +250,7 @@ def list_schedules_command():
     from App.models import Schedule
     admin = require_admin_login()
     
-    schedules = Schedule.query.all()
+    schedules = Schedule.query.options(Schedule.json_loader()).all()
     print(f"✅ Found {len(schedules)} schedule(s):")
     for s in schedules:
         print(s.get_json())
@@ -216,7 +262,7 @@ def view_schedule_command(schedule_id):
     from App.models import Schedule
     admin = require_admin_login()
     
-    schedule = db.session.get(Schedule, schedule_id)
+    schedule = db.session.get(Schedule, schedule_id, options=[Schedule.json_loader()])
     if not schedule:
         print("⚠️ Schedule not found.")
     else:
@@ -226,21 +272,42 @@ def view_schedule_command(schedule_id):
 
 
 #Auto Populate Schedule Command
+# CLI strategy names -> GroupRosterFactory strategy keys
+AUTOPOPULATE_STRATEGIES = {
+    "even": "even_distribution",
+    "minimize_days": "minimize_day",
+    "day_night": "day_night_balanced",
+    "min_cost_flow": "min_cost_flow",
+    "auto": "auto",
+}
+
 @schedule_cli.command("autopopulate", help="Auto-populate schedule with strategy")
 @click.argument("schedule_group_id", type=int)
-@click.argument("strategy", type=click.Choice(["even", "minimize_days", "day_night"]))
+@click.argument("strategy", type=click.Choice(list(AUTOPOPULATE_STRATEGIES)))
 @click.option("--start-date", required=True)
 @click.option("--end-date", required=True)
 @click.option("--shift-duration", default=8)
-def autopopulate_command(schedule_group_id, strategy, start_date, end_date, shift_duration):
+@click.option("--window", type=click.Choice(["none", "day", "week"]), default="none",
+              help="Stream shifts a day or week at a time, saving each window before building the next")
+def autopopulate_command(schedule_group_id, strategy, start_date, end_date, shift_duration, window):
 
     from App.models import Shift
-    from App.controllers.admin import auto_populate_schedule
+    from App.controllers.admin import auto_populate_schedule, iter_shift_windows, stream_populate_schedule
+
+    if window != "none" and strategy == "auto":
+        raise click.UsageError("--window can't be used with the auto strategy, it compares strategies over the whole range")
 
     admin = require_admin_login()
 
     start = datetime.fromisoformat(start_date)
     end = datetime.fromisoformat(end_date)
+    strategy_name = AUTOPOPULATE_STRATEGIES[strategy]
+
+    if window != "none":
+        windows = iter_shift_windows(start, end, shift_duration, window_days=1 if window == "day" else 7)
+        total = stream_populate_schedule(admin.id, schedule_group_id, windows, strategy_name)
+        print(f"✅ Auto-populated {total} shift(s) using '{strategy}' strategy, one {window} at a time")
+        return
 
     shifts = []
     current = start
@@ -255,10 +322,29 @@ def autopopulate_command(schedule_group_id, strategy, start_date, end_date, shif
 
         current += timedelta(days=1)
 
-    schedule_group = auto_populate_schedule(admin.id, schedule_group_id, shifts, strategy)
+    schedule_group = auto_populate_schedule(admin.id, schedule_group_id, shifts, strategy_name)
 
     print(f"✅ Auto-populated schedule using '{strategy}' strategy:")
-    print(schedule_group.get_json())
+    print(ScheduleGroup.get_for_json(schedule_group.id).get_json())
+
+
+@schedule_cli.command("conflicts", help="List overlapping shifts given to the same staff member in a schedule group")
+@click.argument("schedule_group_id", type=int)
+def conflicts_command(schedule_group_id):
+    from App.models.ScheduleGroup import ScheduleGroup
+
+    schedule_group = db.session.get(ScheduleGroup, schedule_group_id)
+    if not schedule_group:
+        print("❌ Schedule group not found")
+        return
+
+    conflicts = schedule_group.find_conflicts()
+    if not conflicts:
+        print("✅ No overlapping shifts")
+        return
+    for conflict in conflicts:
+        print(f"⚠️  Staff {conflict.staff_id}: shift {conflict.first} overlaps shift {conflict.second}")
+    print(f"{len(conflicts)} conflict(s) found")
 
 app.cli.add_command(schedule_cli)
 